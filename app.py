@@ -3,7 +3,11 @@ import pandas as pd
 import streamlit as st
 from PIL import Image
 
-from src.load_data import carregar_sharepoint
+from src.desempenho import finalizar_rerun, iniciar_rerun
+from src.load_data import carregar_dados, status_dados
+from src.multipla_escolha import categorias_presentes
+from src.tracing import count, span
+from src.utils.filters import IndiceFiltros, aplicar_filtros
 from src.visualizations import (
     grafico_renda,
     grafico_cargo,
@@ -19,21 +23,24 @@ from src.visualizations import (
     grafico_expectativas_curso,
     grafico_objetivos_profissionais,
     grafico_recomendacao,
+    grafico_justificativa_recomendacao,
 )
 
 # ⚙️ Configuração inicial
 st.set_page_config(page_title="Análise Ingressantes")
 st.title("📊 Análise Perfil dos Ingressantes")
 
-# 📥 Carregar dados do SharePoint
-try:
-    df = carregar_sharepoint()
+# ⏱️ Spans deste rerun (painel de desempenho / métricas)
+inicio_rerun = iniciar_rerun()
 
-    st.success("Base carregada da API do SharePoint ✅")
+# 📥 Carregar dados (SharePoint por padrão; CSV/Parquet local via FONTE_DADOS)
+try:
+    df = carregar_dados()
 
-    # 🔥 DEBUG CRÍTICO (NÃO REMOVER AGORA)
-    st.write("### 🔍 Colunas carregadas do SharePoint:")
-    st.write(df.columns.tolist())
+    if status_dados()["source"] in ("graph", "snapshot"):
+        st.success("Base carregada da API do SharePoint ✅")
+    else:
+        st.success("Base carregada do arquivo local ✅")
 
 except Exception as erro:
     st.error(f"Erro ao carregar da API: {erro}")
@@ -46,18 +53,7 @@ if os.path.exists(logo_path):
 else:
     st.sidebar.warning(f"Logo não encontrada: {logo_path}")
 
-# 🕓 Tratamento de datas
-if "Hora de início" in df.columns:
-    df["Hora de início"] = pd.to_datetime(df["Hora de início"], errors="coerce", dayfirst=True)
-
-    def extrair_semestre(data):
-        if pd.isnull(data):
-            return None
-        return f"{data.year}-{1 if data.month <= 6 else 2}"
-
-    df["Semestre"] = df["Hora de início"].apply(extrair_semestre)
-else:
-    df["Semestre"] = None
+# 🕓 "Hora de início" já vem convertida e "Semestre" já vem calculado pelo loader
 
 # 🖱️ Filtros
 st.sidebar.title("Filtros de Análise")
@@ -65,39 +61,43 @@ st.sidebar.title("Filtros de Análise")
 curso_col = "Qual o seu Curso?"
 periodo_col = "Qual é o seu período?"
 
-curso = st.sidebar.selectbox(
-    "Selecione o Curso",
-    ["Todos"] + list(df[curso_col].dropna().unique()) if curso_col in df.columns else ["Todos"]
-)
+# 🗂️ Índice dos filtros (opções + posições por valor), um por versão da base
+@st.cache_resource(max_entries=2)
+def indice_filtros(versao, _df: pd.DataFrame) -> IndiceFiltros:
+    return IndiceFiltros(_df, [curso_col, periodo_col, "Semestre"], decrescentes=("Semestre",))
 
-periodo = st.sidebar.selectbox(
-    "Selecione o Turno",
-    ["Todos"] + list(df[periodo_col].dropna().unique()) if periodo_col in df.columns else ["Todos"]
-)
 
-semestres_disponiveis = sorted(df["Semestre"].dropna().unique(), reverse=True) if "Semestre" in df.columns else []
-semestre = st.sidebar.selectbox("Período Letivo", ["Todos"] + semestres_disponiveis)
+indice = indice_filtros(df.attrs.get("versao"), df)
 
-# 📄 Aplicar filtros
-df_filtrado = df.copy()
+curso = st.sidebar.selectbox("Selecione o Curso", indice.opcoes_de(curso_col))
 
-if curso != "Todos" and curso_col in df.columns:
-    df_filtrado = df_filtrado[df_filtrado[curso_col] == curso]
+periodo = st.sidebar.selectbox("Selecione o Turno", indice.opcoes_de(periodo_col))
 
-if periodo != "Todos" and periodo_col in df.columns:
-    df_filtrado = df_filtrado[df_filtrado[periodo_col] == periodo]
+semestre = st.sidebar.selectbox("Período Letivo", indice.opcoes_de("Semestre"))
 
-if semestre != "Todos":
-    df_filtrado = df_filtrado[df_filtrado["Semestre"] == semestre]
+# 📄 Aplicar filtros (interseção de posições, sem copiar a base inteira)
+df_filtrado = aplicar_filtros(df, indice, {curso_col: curso, periodo_col: periodo, "Semestre": semestre})
 
 st.sidebar.markdown(f"**Total de respostas: {len(df_filtrado)}**")
 
-# 📊 GRÁFICOS (com proteção contra erro)
-def safe_plot(func, df):
+# 🕒 Idade dos dados e status da atualização em segundo plano
+status = status_dados()
+if status["age_seconds"] is not None:
+    st.sidebar.caption(f"Dados atualizados há {int(status['age_seconds'] // 60)} min")
+if status["refreshing"]:
+    st.sidebar.caption("🔄 Atualizando dados em segundo plano...")
+if status["last_error"]:
+    st.sidebar.warning(f"Última atualização falhou; exibindo a última base válida. ({status['last_error']})")
+
+# 📊 GRÁFICOS (com proteção contra erro e tempo por gráfico)
+def safe_plot(func, df, nome=None):
+    nome = nome or func.__name__
     try:
-        func(df)
+        with span("plot", chart=nome):
+            func(df)
     except Exception as e:
-        st.warning(f"Erro no gráfico {func.__name__}: {e}")
+        count("plot_errors", chart=nome)
+        st.warning(f"Erro no gráfico {nome}: {e}")
 
 safe_plot(grafico_renda, df_filtrado)
 safe_plot(grafico_cargo, df_filtrado)
@@ -109,12 +109,11 @@ st.markdown("---")
 # 🔎 Subcategorias
 categoria_detalhe = st.selectbox(
     "Explorar categoria:",
-    ["", "Indicação", "Pesquisa Online", "Redes Sociais", "Comunicação",
-     "Eventos", "Reputação/Ranking", "Programas Públicos", "Convênios"]
+    [""] + categorias_presentes(df_filtrado, "canais")
 )
 
 if categoria_detalhe:
-    safe_plot(lambda df: grafico_subcategorias(df, categoria_detalhe), df_filtrado)
+    safe_plot(lambda df: grafico_subcategorias(df, categoria_detalhe), df_filtrado, "grafico_subcategorias")
 
 # 🔥 Esses estavam quebrando — agora protegidos
 safe_plot(grafico_influencia_fatores, df_filtrado)
@@ -126,15 +125,18 @@ st.markdown("---")
 # 🔍 Subcategorias por instituição
 categoria_proc = st.selectbox(
     "Explorar tipo de instituição:",
-    ["", "Privadas", "Federais", "Estaduais", "Não prestou", "Outro"]
+    [""] + categorias_presentes(df_filtrado, "instituicoes")
 )
 
 if categoria_proc:
-    safe_plot(lambda df: grafico_subcategorias_processo(df, categoria_proc), df_filtrado)
+    safe_plot(lambda df: grafico_subcategorias_processo(df, categoria_proc), df_filtrado, "grafico_subcategorias_processo")
 
 safe_plot(grafico_percepcao_qualidade, df_filtrado)
 safe_plot(grafico_motivos_escolha, df_filtrado)
 safe_plot(grafico_expectativas_curso, df_filtrado)
 safe_plot(grafico_objetivos_profissionais, df_filtrado)
 safe_plot(grafico_recomendacao, df_filtrado)
+safe_plot(grafico_justificativa_recomendacao, df_filtrado)
 
+# ⏱️ Fecha o rerun: métricas exportadas e painel (se habilitado)
+finalizar_rerun(inicio_rerun)
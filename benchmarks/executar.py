@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.colunas import (
+    COLUNA_CURSO,
+    COLUNA_EXPECTATIVAS,
+    COLUNA_JUSTIFICATIVA,
+    COLUNA_MOTIVOS,
+    COLUNA_OBJETIVOS,
+    COLUNA_PERIODO,
+    COLUNA_RECOMENDACAO,
+    COLUNAS_IES,
+    COLUNAS_INFLUENCIA,
+    COLUNAS_SATISFACAO,
+    ESCALA_INFLUENCIA,
+    ESCALA_QUALIDADE,
+    ESCALA_SATISFACAO,
+)
+from src.load_data import COLUNA_SEMESTRE, CORTE_SEMESTRE, aplicar_schema, derivar_periodos_letivos
+from src.preprocess_text import tipo_da_coluna
+from src.sharepoint_client import normalize_columns
+from src.utils.filters import IndiceFiltros, aplicar_filtros
+from src.utils.helpers import registrar_base
+from src import visualizations as v
+
+from .sintetico import carregar_amostra, gerar_base
+
+
+# ⏱️ Benchmark das etapas quentes do dashboard (sem renderizar nada)
+#
+#   python -m benchmarks.executar                          # 1k, 10k, 100k e 1M linhas
+#   python -m benchmarks.executar --tamanhos 1000 10000 --saida atual.json
+#   python -m benchmarks.executar --salvar-baseline minha_maquina.json
+#   python -m benchmarks.executar --baseline minha_maquina.json --tolerancia 0.2
+#
+# Com --baseline, sai com código 1 se alguma etapa ficar mais lenta que a
+# baseline além da tolerância. Tempos só são comparáveis na mesma máquina: grave
+# a baseline no próprio ambiente de medição (benchmarks/baseline.json é só uma
+# referência, com o ambiente em "meta").
+TAMANHOS_PADRAO = [1_000, 10_000, 100_000, 1_000_000]
+
+# Campos de "meta" que identificam o ambiente da medição
+AMBIENTE = ("python", "pandas", "numpy", "plataforma", "processador")
+
+# Diferenças abaixo disso (s) são ruído, mesmo que a razão passe da tolerância
+DIFERENCA_MINIMA = 0.002
+
+
+def _cronometrar(func, repeticoes: int, preparar=None) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        argumento = preparar() if preparar is not None else None
+        inicio = time.perf_counter()
+        func(argumento) if preparar is not None else func()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        "min": min(tempos),
+        "mediana": statistics.median(tempos),
+        "repeticoes": repeticoes,
+    }
+
+
+def _repeticoes(n: int, padrao: int) -> int:
+    if n >= 1_000_000:
+        return 1
+    if n >= 100_000:
+        return min(padrao, 3)
+    return padrao
+
+
+# 📊 Agregações de cada grafico_* (sem cache de agregados: __wrapped__)
+def _agregacoes(df: pd.DataFrame) -> dict:
+    coluna_renda = next(c for c in df.columns if "renda individual" in c.lower())
+    coluna_cargo = next(c for c in df.columns if "nível hierárquico" in c.lower())
+    coluna_primeira = next(c for c in df.columns if "primeira experiência" in c.lower())
+
+    agregacoes = {
+        "renda": lambda: v._dados_renda.__wrapped__(df, coluna_renda),
+        "cargo": lambda: v._dados_cargo.__wrapped__(df, coluna_cargo),
+        "primeira_faculdade": lambda: v._dados_primeira_faculdade.__wrapped__(df, coluna_primeira),
+        "canais": lambda: v._dados_categorias.__wrapped__(df, "canais"),
+        "subcategorias_canais": lambda: v._dados_subcategorias.__wrapped__(df, "canais", "Indicação"),
+        "influencia": lambda: v._dados_likert.__wrapped__(df, tuple(COLUNAS_INFLUENCIA), tuple(ESCALA_INFLUENCIA), "Fator"),
+        "satisfacao": lambda: v._dados_likert.__wrapped__(df, tuple(COLUNAS_SATISFACAO), tuple(ESCALA_SATISFACAO), "Processo"),
+        "instituicoes": lambda: v._dados_categorias.__wrapped__(df, "instituicoes"),
+        "subcategorias_instituicoes": lambda: v._dados_subcategorias.__wrapped__(df, "instituicoes", "Privadas"),
+        "percepcao": lambda: v._dados_likert.__wrapped__(df, tuple(COLUNAS_IES), tuple(ESCALA_QUALIDADE), "Instituição"),
+        "recomendacao": lambda: v._dados_recomendacao.__wrapped__(df, COLUNA_RECOMENDACAO),
+    }
+
+    for coluna in (COLUNA_MOTIVOS, COLUNA_EXPECTATIVAS, COLUNA_OBJETIVOS, COLUNA_JUSTIFICATIVA):
+        if coluna in df.columns:
+            tipo = tipo_da_coluna(coluna)
+            agregacoes[f"palavras_{tipo}"] = (lambda c, t: lambda: v._dados_palavras.__wrapped__(df, c, t))(coluna, tipo)
+
+    return agregacoes
+
+
+def _selecao_mais_comum(df: pd.DataFrame) -> dict:
+    return {
+        coluna: df[coluna].mode().iloc[0]
+        for coluna in (COLUNA_CURSO, COLUNA_PERIODO, COLUNA_SEMESTRE)
+        if coluna in df.columns and df[coluna].notna().any()
+    }
+
+
+def medir(n: int, amostra: pd.DataFrame, repeticoes: int, versao: int) -> dict:
+    repeticoes = _repeticoes(n, repeticoes)
+    bruto = gerar_base(n, amostra)
+    resultados = {}
+
+    # 🔧 Etapas da carga (cada repetição parte de uma cópia do DataFrame cru)
+    resultados["normalize_columns"] = _cronometrar(normalize_columns, repeticoes, preparar=bruto.copy)
+
+    df = normalize_columns(bruto.copy())
+    df["Hora de início"] = pd.to_datetime(df["Hora de início"], errors="coerce", dayfirst=True)
+    resultados["aplicar_schema"] = _cronometrar(aplicar_schema, repeticoes, preparar=df.copy)
+
+    df = aplicar_schema(df)
+    resultados["derivar_periodos_letivos"] = _cronometrar(
+        lambda d: derivar_periodos_letivos(d, CORTE_SEMESTRE), repeticoes, preparar=df.copy
+    )
+    df = derivar_periodos_letivos(df, CORTE_SEMESTRE)
+
+    # 🗂️ Cadeia de filtros do app.py: índice (uma vez por versão) + aplicação
+    colunas_filtro = [COLUNA_CURSO, COLUNA_PERIODO, COLUNA_SEMESTRE]
+    resultados["filtros_indice"] = _cronometrar(lambda: IndiceFiltros(df, colunas_filtro, decrescentes=(COLUNA_SEMESTRE,)), repeticoes)
+
+    indice = IndiceFiltros(df, colunas_filtro, decrescentes=(COLUNA_SEMESTRE,))
+    selecao = _selecao_mais_comum(df)
+    resultados["filtros_aplicar"] = _cronometrar(lambda: aplicar_filtros(df, indice, selecao), repeticoes)
+
+    # 📊 Agregações: base inteira sem versão (frio, tudo calculado do zero) e
+    # recorte filtrado de uma base registrada (estruturas por versão já montadas)
+    for nome, func in _agregacoes(df).items():
+        resultados[f"agregacao_{nome}"] = _cronometrar(func, repeticoes)
+
+    df.attrs["versao"] = versao
+    registrar_base(df)
+    recorte = aplicar_filtros(df, indice, selecao)
+    for nome, func in _agregacoes(recorte).items():
+        func()  # monta tabelas longas/índices da versão
+        resultados[f"agregacao_filtrada_{nome}"] = _cronometrar(func, repeticoes)
+
+    return resultados
+
+
+# 📈 Razão atual/baseline (tempo mínimo) por tamanho e etapa
+def comparar(atual: dict, baseline: dict, tolerancia: float) -> list:
+    regressoes = []
+
+    for tamanho, etapas in atual["resultados"].items():
+        etapas_base = baseline.get("resultados", {}).get(tamanho, {})
+        for etapa, medida in etapas.items():
+            if etapa not in etapas_base:
+                continue
+            antes, depois = etapas_base[etapa]["min"], medida["min"]
+            razao = depois / antes if antes > 0 else float("inf")
+            if razao > 1 + tolerancia and depois - antes > DIFERENCA_MINIMA:
+                regressoes.append((tamanho, etapa, antes, depois, razao))
+
+    return regressoes
+
+
+def _metadados(args) -> dict:
+    return {
+        "data": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "repeticoes": args.repeticoes,
+        "seed": 42,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do dashboard (sem renderização).")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="Arquivo JSON com os resultados (padrão: stdout)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior (mesma máquina) para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora aceita (0.2 = 20%%)")
+    parser.add_argument("--salvar-baseline", help="Grava os resultados também como nova baseline")
+    args = parser.parse_args(argv)
+
+    amostra = carregar_amostra()
+    resultado = {"meta": _metadados(args), "resultados": {}}
+
+    for versao, n in enumerate(args.tamanhos, start=1):
+        inicio = time.perf_counter()
+        resultado["resultados"][str(n)] = medir(n, amostra, args.repeticoes, versao)
+        print(f"{n:>9} linhas: {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+
+    conteudo = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+    else:
+        print(conteudo)
+
+    if args.salvar_baseline:
+        os.makedirs(os.path.dirname(args.salvar_baseline) or ".", exist_ok=True)
+        with open(args.salvar_baseline, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        diferencas = [c for c in AMBIENTE if baseline.get("meta", {}).get(c) != resultado["meta"][c]]
+        if diferencas:
+            print(f"AVISO: baseline de outro ambiente ({', '.join(diferencas)}); tempos podem não ser comparáveis.", file=sys.stderr)
+
+        regressoes = comparar(resultado, baseline, args.tolerancia)
+        for tamanho, etapa, antes, depois, razao in regressoes:
+            print(f"REGRESSÃO {tamanho:>9} {etapa:40s} {antes * 1000:9.2f}ms -> {depois * 1000:9.2f}ms ({razao:.2f}x)", file=sys.stderr)
+        if regressoes:
+            return 1
+        print("Sem regressões em relação à baseline.", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import pandas as pd
+
+from src.load_data import LIST_NAME
+
+from .sintetico import carregar_amostra, gerar_base
+
+
+# 🧪 Graph/OAuth local para testar o GraphClient de ponta a ponta sem o tenant:
+# token, site, listas, colunas e itens (completo e delta) paginados, gerados
+# do CSV de exemplo (mesma projeção sem dados pessoais) ou da base sintética.
+#
+#   python -m benchmarks.graph_local --porta 8765 --latencia 0.05 --pagina-maxima 500
+#   python -m benchmarks.graph_local --linhas 100000 --throttle-a-cada 10 --padding 2048
+#
+# No secrets.toml do app:
+#   GRAPH_BASE_URL = "http://127.0.0.1:8765/v1.0"
+#   GRAPH_AUTHORITY = "http://127.0.0.1:8765"
+#
+# Comportamento configurável (determinístico, sem sorteio):
+# - latencia: atraso fixo (s) antes de cada resposta
+# - pagina / pagina_maxima: $top padrão e teto aplicado ao $top pedido
+# - throttle_a_cada: a cada N requisições, uma recebe 429 + Retry-After
+# - erro_a_cada: a cada N requisições, uma recebe 503 (falha transitória)
+# - padding: bytes extras por item (fora de "fields") para simular payload maior
+# - expira_em: validade do token; token vencido ou revogado recebe 401
+#
+# Delta: alterar() inclui/atualiza/remove itens (o próximo deltaLink traz só
+# essas mudanças, remoções com "@removed") e expirar_delta() invalida os
+# deltaLinks emitidos (410 resyncRequired). Limitação: $filter é ignorado.
+SITE_ID = "local.sharepoint.com,00000000-0000-0000-0000-000000000001,00000000-0000-0000-0000-000000000002"
+LIST_ID = "00000000-0000-0000-0000-000000000003"
+
+PAGINA_PADRAO = 200
+PAGINA_MAXIMA = 5000
+
+_SELECT = re.compile(r"fields\(\$select=([^)]*)\)")
+
+
+# 🧾 Itens no formato do Graph: nomes internos (field_N) e campos nulos omitidos
+def _montar_itens(df: pd.DataFrame):
+    colunas = {f"field_{i}": nome for i, nome in enumerate(df.columns, start=1)}
+    internos = list(colunas)
+
+    itens = []
+    for posicao, valores in enumerate(df.itertuples(index=False, name=None), start=1):
+        campos = {
+            interno: str(valor)
+            for interno, valor in zip(internos, valores)
+            if not pd.isna(valor)
+        }
+        itens.append((str(posicao), campos))
+
+    return colunas, itens
+
+
+class GraphLocal:
+    def __init__(
+        self,
+        dados: pd.DataFrame = None,
+        host: str = "127.0.0.1",
+        porta: int = 0,
+        latencia: float = 0.0,
+        pagina: int = PAGINA_PADRAO,
+        pagina_maxima: int = PAGINA_MAXIMA,
+        throttle_a_cada: int = 0,
+        retry_after: int = 1,
+        erro_a_cada: int = 0,
+        padding: int = 0,
+        expira_em: int = 3600,
+        nome_lista: str = LIST_NAME,
+    ):
+        if dados is None:
+            dados = carregar_amostra()
+
+        self.colunas, self.itens = _montar_itens(dados)
+        self.latencia = latencia
+        self.pagina = pagina
+        self.pagina_maxima = pagina_maxima
+        self.throttle_a_cada = throttle_a_cada
+        self.retry_after = retry_after
+        self.erro_a_cada = erro_a_cada
+        self.padding = "x" * padding
+        self.expira_em = expira_em
+        self.nome_lista = nome_lista
+
+        self._tokens: dict = {}
+        self._sessao_delta = uuid.uuid4().hex
+        self._revisao = 0
+        self._alteracoes: dict = {}  # id -> (revisão, campos ou None se removido)
+        self._contadores = {
+            "requisicoes": 0,
+            "tokens": 0,
+            "paginas": 0,
+            "throttled": 0,
+            "erros": 0,
+            "nao_autorizado": 0,
+            "bytes": 0,
+        }
+        self._lock = threading.Lock()
+
+        self._http = ThreadingHTTPServer((host, porta), _Handler)
+        self._http.daemon_threads = True
+        self._http.graph = self
+        self._thread = None
+
+    # 🌐 Endereços para o GraphClient (base_url / authority)
+    @property
+    def authority(self) -> str:
+        host, porta = self._http.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.authority}/v1.0"
+
+    def iniciar(self) -> "GraphLocal":
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        self._http.shutdown()
+        self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+    def contadores(self) -> dict:
+        with self._lock:
+            return dict(self._contadores)
+
+    def zerar_contadores(self) -> None:
+        with self._lock:
+            for chave in self._contadores:
+                self._contadores[chave] = 0
+
+    def _contar(self, chave: str, valor: int = 1) -> int:
+        with self._lock:
+            self._contadores[chave] += valor
+            return self._contadores[chave]
+
+    # 🚦 Recusa determinística: a N-ésima, 2N-ésima... requisição recebe 429 (ou 503)
+    def _recusar(self):
+        numero = self._contar("requisicoes")
+        if self.throttle_a_cada and numero % self.throttle_a_cada == 0:
+            self._contar("throttled")
+            return 429
+        if self.erro_a_cada and numero % self.erro_a_cada == 0:
+            self._contar("erros")
+            return 503
+        return None
+
+    # ✏️ Mudanças na lista (nomes de exibição -> valores); aparecem no próximo delta
+    def alterar(self, alterados: dict = None, removidos=()) -> None:
+        internos = {nome: interno for interno, nome in self.colunas.items()}
+
+        with self._lock:
+            self._revisao += 1
+            posicoes = {item_id: i for i, (item_id, _) in enumerate(self.itens)}
+
+            for item_id, valores in (alterados or {}).items():
+                campos = {internos[nome]: str(valor) for nome, valor in valores.items()}
+                if item_id in posicoes:
+                    campos = {**self.itens[posicoes[item_id]][1], **campos}
+                    self.itens[posicoes[item_id]] = (item_id, campos)
+                else:
+                    self.itens.append((item_id, campos))
+                self._alteracoes[item_id] = (self._revisao, campos)
+
+            removidos = set(removidos)
+            self.itens = [(item_id, campos) for item_id, campos in self.itens if item_id not in removidos]
+            for item_id in removidos:
+                self._alteracoes[item_id] = (self._revisao, None)
+
+    # ⌛ deltaLinks já emitidos passam a receber 410 (resyncRequired)
+    def expirar_delta(self) -> None:
+        with self._lock:
+            self._sessao_delta = uuid.uuid4().hex
+
+    def revogar_tokens(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+    def _delta_link(self, url: str) -> str:
+        return url.split("?")[0] + f"?token={self._sessao_delta}.{self._revisao}"
+
+    def emitir_token(self) -> dict:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.time() + self.expira_em
+            self._contadores["tokens"] += 1
+        return {"token_type": "Bearer", "expires_in": self.expira_em, "access_token": token}
+
+    def autorizado(self, cabecalho: str) -> bool:
+        token = (cabecalho or "").removeprefix("Bearer ")
+        with self._lock:
+            expira = self._tokens.get(token)
+        return expira is not None and time.time() < expira
+
+    # 🆔 Como no Graph: o id fica no item; "fields" traz só o que o $select pediu
+    def _item(self, item_id: str, item: dict, campos: set) -> dict:
+        fields = item if campos is None else {k: v for k, v in item.items() if k in campos}
+        valor = {"id": item_id, "fields": {"@odata.etag": f'"{item_id},1"', **fields}}
+        if self.padding:
+            valor["padding"] = self.padding
+        return valor
+
+    # 🔁 Mudanças desde a revisão do token, numa página só (None -> 410)
+    def _pagina_delta(self, url: str, token: str, campos: set):
+        sessao, _, revisao = token.partition(".")
+        with self._lock:
+            if sessao != self._sessao_delta or not revisao.isdigit():
+                return None
+
+            valores = []
+            for item_id, (alterado_em, item) in self._alteracoes.items():
+                if alterado_em <= int(revisao):
+                    continue
+                if item is None:
+                    valores.append({"id": item_id, "@removed": {"reason": "deleted"}})
+                else:
+                    valores.append(self._item(item_id, item, campos))
+
+            return {"value": valores, "@odata.deltaLink": self._delta_link(url)}
+
+    # 📄 Uma página de itens; `inicio` vem do $skiptoken do nextLink
+    def pagina_itens(self, url: str, query: dict, delta: bool) -> dict:
+        select = _SELECT.search(query.get("expand", ""))
+        campos = set(select.group(1).split(",")) if select else None
+
+        if delta and "token" in query:
+            pagina = self._pagina_delta(url, query["token"], campos)
+            if pagina is not None:
+                self._contar("paginas")
+            return pagina
+
+        top = int(query.get("$top", self.pagina))
+        top = max(1, min(top, self.pagina_maxima))
+        inicio = int(query.get("$skiptoken", 0))
+
+        with self._lock:
+            fim = min(inicio + top, len(self.itens))
+            valores = [self._item(item_id, item, campos) for item_id, item in self.itens[inicio:fim]]
+
+            pagina = {"value": valores}
+            if fim < len(self.itens):
+                pagina["@odata.nextLink"] = url.split("?")[0] + "?" + urlencode(
+                    {**query, "$skiptoken": fim}, safe="$(),="
+                )
+            elif delta:
+                pagina["@odata.deltaLink"] = self._delta_link(url)
+
+        self._contar("paginas")
+        return pagina
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como o Graph
+    disable_nagle_algorithm = True  # cabeçalho e corpo saem em writes separados
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def graph(self) -> GraphLocal:
+        return self.server.graph
+
+    def _responder(self, status: int, corpo: dict, cabecalhos: dict = None) -> None:
+        dados = json.dumps(corpo).encode("utf-8")
+        self.graph._contar("bytes", len(dados))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        for chave, valor in (cabecalhos or {}).items():
+            self.send_header(chave, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _erro(self, status: int, codigo: str, mensagem: str, cabecalhos: dict = None) -> None:
+        self._responder(status, {"error": {"code": codigo, "message": mensagem}}, cabecalhos)
+
+    # ⏳ Latência, throttling e falhas valem para todas as rotas (token inclusive)
+    def _antes(self) -> bool:
+        if self.graph.latencia:
+            time.sleep(self.graph.latencia)
+
+        status = self.graph._recusar()
+        if status == 429:
+            self._erro(429, "TooManyRequests", "Muitas requisições.", {"Retry-After": str(self.graph.retry_after)})
+            return False
+        if status == 503:
+            self._erro(503, "serviceNotAvailable", "Serviço indisponível.")
+            return False
+
+        return True
+
+    def do_POST(self):
+        tamanho = int(self.headers.get("Content-Length", 0))
+        corpo = dict(parse_qsl(self.rfile.read(tamanho).decode("utf-8")))
+
+        if not self._antes():
+            return
+
+        if not urlsplit(self.path).path.endswith("/oauth2/v2.0/token"):
+            return self._erro(404, "itemNotFound", "Rota inexistente.")
+        if corpo.get("grant_type") != "client_credentials" or not corpo.get("client_secret"):
+            return self._erro(400, "invalid_request", "Credenciais ausentes.")
+
+        self._responder(200, self.graph.emitir_token())
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        caminho = unquote(partes.path)
+        query = dict(parse_qsl(partes.query, keep_blank_values=True))
+        url = f"{self.graph.authority}{partes.path}" + (f"?{partes.query}" if partes.query else "")
+
+        if not self._antes():
+            return
+
+        if caminho == "/_stats":
+            return self._responder(200, self.graph.contadores())
+
+        if not self.graph.autorizado(self.headers.get("Authorization")):
+            self.graph._contar("nao_autorizado")
+            return self._erro(401, "InvalidAuthenticationToken", "Token ausente ou expirado.")
+
+        base = f"/v1.0/sites/{SITE_ID}"
+        lista = f"{base}/lists/{LIST_ID}"
+
+        if caminho == f"{lista}/items" or caminho == f"{lista}/items/delta":
+            delta = caminho.endswith("/delta")
+            pagina = self.graph.pagina_itens(url, query, delta)
+            if pagina is None:
+                return self._erro(410, "resyncRequired", "deltaLink expirado.")
+            return self._responder(200, pagina)
+
+        if caminho == f"{lista}/columns":
+            colunas = [{"name": interno, "displayName": nome} for interno, nome in self.graph.colunas.items()]
+            return self._responder(200, {"value": colunas})
+
+        if caminho == f"{base}/lists":
+            return self._responder(200, {"value": [{"id": LIST_ID, "name": self.graph.nome_lista}]})
+
+        if caminho.startswith("/v1.0/sites/") and ":" in caminho:
+            return self._responder(200, {"id": SITE_ID})
+
+        self._erro(404, "itemNotFound", "Rota inexistente.")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Graph/OAuth local servindo a lista a partir do CSV de exemplo.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--linhas", type=int, help="Base sintética com N linhas (padrão: o CSV de exemplo)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Atraso por requisição (s)")
+    parser.add_argument("--pagina", type=int, default=PAGINA_PADRAO, help="Itens por página sem $top")
+    parser.add_argument("--pagina-maxima", type=int, default=PAGINA_MAXIMA, help="Teto para o $top pedido")
+    parser.add_argument("--throttle-a-cada", type=int, default=0, help="Responde 429 a cada N requisições (0 = nunca)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Valor do Retry-After (s) nos 429")
+    parser.add_argument("--erro-a-cada", type=int, default=0, help="Responde 503 a cada N requisições (0 = nunca)")
+    parser.add_argument("--padding", type=int, default=0, help="Bytes extras por item")
+    parser.add_argument("--expira-em", type=int, default=3600, help="Validade do token (s)")
+    args = parser.parse_args(argv)
+
+    dados = gerar_base(args.linhas) if args.linhas else None
+    graph = GraphLocal(
+        dados,
+        host=args.host,
+        porta=args.porta,
+        latencia=args.latencia,
+        pagina=args.pagina,
+        pagina_maxima=args.pagina_maxima,
+        throttle_a_cada=args.throttle_a_cada,
+        retry_after=args.retry_after,
+        erro_a_cada=args.erro_a_cada,
+        padding=args.padding,
+        expira_em=args.expira_em,
+    )
+
+    print(f"Graph local em {graph.base_url} ({len(graph.itens)} itens). Ctrl+C para sair.")
+    graph.iniciar()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        graph.parar()
+
+
+if __name__ == "__main__":
+    main()
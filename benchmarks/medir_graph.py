@@ -0,0 +1,149 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from src.colunas import colunas_dashboard
+from src.load_data import HOSTNAME, LIST_NAME, SITE_PATH
+from src.sharepoint_client import GraphClient
+
+from .executar import _metadados, comparar
+from .graph_local import GraphLocal
+from .sintetico import carregar_amostra, gerar_base
+
+
+# 🌐 Vazão do GraphClient contra o Graph local (ponta a ponta, sem tenant):
+# leitura completa com e sem prefetch por tamanho de página, delta inicial e
+# delta sem alterações; cenários com latência e throttling opcionais
+#
+#   python -m benchmarks.medir_graph --linhas 10000 --latencia 0.02
+#   python -m benchmarks.medir_graph --throttle-a-cada 7 --retry-after 0 --saida graph.json
+#   python -m benchmarks.medir_graph --baseline benchmarks/baseline_graph.json
+#
+# Mesmo formato de saída (e comparação com baseline) do benchmarks.executar.
+PAGINAS_PADRAO = [200, 1000, 5000]
+
+
+def _cliente(graph: GraphLocal, pagina: int, prefetch: bool, args) -> GraphClient:
+    return GraphClient(
+        tenant_id="local",
+        client_id="benchmark",
+        client_secret="benchmark",
+        page_size=pagina,
+        prefetch=prefetch,
+        max_retries=args.max_retries,
+        backoff_factor=0,
+        base_url=graph.base_url,
+        authority=graph.authority,
+    )
+
+
+# ⏱️ Tempos + contadores do servidor da última repetição (requisições, 429, bytes)
+def _cronometrar(graph: GraphLocal, func, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        graph.zerar_contadores()
+        inicio = time.perf_counter()
+        linhas = func()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        "min": min(tempos),
+        "mediana": statistics.median(tempos),
+        "repeticoes": repeticoes,
+        "linhas": linhas,
+        "linhas_por_s": linhas / min(tempos) if min(tempos) > 0 else None,
+        **graph.contadores(),
+    }
+
+
+def medir(graph: GraphLocal, args) -> dict:
+    resultados = {}
+
+    for pagina in args.paginas:
+        for prefetch in (False, True):
+            client = _cliente(graph, pagina, prefetch, args)
+
+            # Descoberta como no app: site -> lista -> colunas projetadas
+            site_id = client.get_site_id(HOSTNAME, SITE_PATH)
+            list_id = client.get_list_id_by_name(site_id, LIST_NAME)
+            mapa = client.get_list_columns(site_id, list_id)
+            select = [mapa[c] for c in colunas_dashboard(mapa)]
+
+            nome = f"pagina_{pagina}_{'prefetch' if prefetch else 'sequencial'}"
+            resultados[f"completa_{nome}"] = _cronometrar(
+                graph, lambda: len(client.fetch_list_frame(site_id, list_id, select)), args.repeticoes
+            )
+
+            resultados[f"delta_inicial_{nome}"] = _cronometrar(
+                graph, lambda: len(client.fetch_list_items_delta(site_id, list_id, select=select)[0]), args.repeticoes
+            )
+
+            _, _, delta_link = client.fetch_list_items_delta(site_id, list_id, select=select)
+            resultados[f"delta_sem_alteracoes_{nome}"] = _cronometrar(
+                graph, lambda: len(client.fetch_list_items_delta(site_id, list_id, delta_link)[0]), args.repeticoes
+            )
+
+    return resultados
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Vazão do GraphClient contra o Graph local.")
+    parser.add_argument("--linhas", type=int, nargs="+", help="Bases sintéticas (padrão: só o CSV de exemplo)")
+    parser.add_argument("--paginas", type=int, nargs="+", default=PAGINAS_PADRAO, help="Valores de $top")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Atraso por requisição no servidor (s)")
+    parser.add_argument("--throttle-a-cada", type=int, default=0, help="429 a cada N requisições (0 = nunca)")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--padding", type=int, default=0, help="Bytes extras por item")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--saida", help="Arquivo JSON com os resultados (padrão: stdout)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora aceita (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    amostra = carregar_amostra()
+    bases = {str(n): gerar_base(n, amostra) for n in args.linhas} if args.linhas else {"amostra": amostra}
+
+    meta = _metadados(args)
+    meta.update(latencia=args.latencia, throttle_a_cada=args.throttle_a_cada, padding=args.padding)
+    resultado = {"meta": meta, "resultados": {}}
+
+    for rotulo, dados in bases.items():
+        graph = GraphLocal(
+            dados,
+            latencia=args.latencia,
+            pagina_maxima=max(args.paginas),
+            throttle_a_cada=args.throttle_a_cada,
+            retry_after=args.retry_after,
+            padding=args.padding,
+        )
+        inicio = time.perf_counter()
+        with graph:
+            resultado["resultados"][rotulo] = medir(graph, args)
+        print(f"{rotulo:>9}: {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+
+    conteudo = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+    else:
+        print(conteudo)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressoes = comparar(resultado, baseline, args.tolerancia)
+        for rotulo, etapa, antes, depois, razao in regressoes:
+            print(f"REGRESSÃO {rotulo:>9} {etapa:45s} {antes * 1000:9.2f}ms -> {depois * 1000:9.2f}ms ({razao:.2f}x)", file=sys.stderr)
+        if regressoes:
+            return 1
+        print("Sem regressões em relação à baseline.", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
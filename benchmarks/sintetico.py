@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from src.colunas import COLUNA_DATA, COLUNAS_ID
+from src.fontes_dados import CAMINHO_CSV_PADRAO, _projecao
+from src.nlp_textos import COLUNAS_NLP
+from src.preprocess_text import PADRAO_PALAVRA
+from src.sharepoint_client import normalize_names
+
+
+# 🧪 Base sintética com o mesmo schema do CSV de exemplo e sem dados pessoais:
+# - só as colunas consumidas pelo dashboard (a projeção já descarta nome, e-mail, RA...)
+# - respostas fechadas sorteadas pela distribuição observada na amostra
+# - respostas abertas montadas com palavras sorteadas do vocabulário da coluna
+#   (nenhum texto de respondente é copiado)
+# - datas uniformes no intervalo da amostra; IDs sequenciais
+
+
+def carregar_amostra(caminho: str = CAMINHO_CSV_PADRAO) -> pd.DataFrame:
+    cabecalho = pd.read_csv(caminho, nrows=0, encoding="utf-8-sig").columns
+    projecao = _projecao(cabecalho)
+    return pd.read_csv(caminho, encoding="utf-8-sig", usecols=list(projecao), dtype=str)
+
+
+def _sortear_fechadas(serie: pd.Series, n: int, rng) -> np.ndarray:
+    frequencias = serie.value_counts(dropna=False, normalize=True)
+    valores = frequencias.index.to_numpy(dtype=object)
+    return rng.choice(valores, size=n, p=frequencias.to_numpy())
+
+
+def _sortear_textos(serie: pd.Series, n: int, rng) -> np.ndarray:
+    textos = serie.dropna().astype(str)
+    palavras = textos.str.lower().str.findall(PADRAO_PALAVRA).explode().dropna()
+    if palavras.empty:
+        return np.full(n, None, dtype=object)
+
+    frequencias = palavras.value_counts(normalize=True)
+    vocabulario = frequencias.index.to_numpy(dtype=object)
+
+    # Tamanho das respostas e proporção de vazias seguem a amostra
+    tamanhos = textos.str.split().str.len().to_numpy()
+    vazias = 1 - len(textos) / max(len(serie), 1)
+    sorteados = rng.choice(tamanhos, size=n)
+    todas = rng.choice(vocabulario, size=int(sorteados.sum()), p=frequencias.to_numpy())
+
+    respostas = np.empty(n, dtype=object)
+    inicio = 0
+    for i, tamanho in enumerate(sorteados):
+        respostas[i] = " ".join(todas[inicio:inicio + tamanho])
+        inicio += tamanho
+
+    respostas[rng.random(n) < vazias] = None
+    return respostas
+
+
+def _sortear_datas(serie: pd.Series, n: int, rng) -> np.ndarray:
+    datas = pd.to_datetime(serie, errors="coerce", dayfirst=True).dropna()
+    inicio, fim = datas.min().value, datas.max().value
+    sorteadas = pd.to_datetime(rng.integers(inicio, fim, size=n))
+    return sorteadas.strftime("%d/%m/%Y %H:%M").to_numpy(dtype=object)
+
+
+# 🏭 DataFrame "cru" (como lido do CSV: nomes originais, tudo texto) com n linhas
+def gerar_base(n: int, amostra: pd.DataFrame = None, seed: int = 42) -> pd.DataFrame:
+    if amostra is None:
+        amostra = carregar_amostra()
+
+    rng = np.random.default_rng(seed)
+    colunas = {}
+
+    for original, nome in zip(amostra.columns, normalize_names(amostra.columns)):
+        if nome in COLUNAS_ID:
+            colunas[original] = np.arange(1, n + 1).astype(str)
+        elif nome == COLUNA_DATA:
+            colunas[original] = _sortear_datas(amostra[original], n, rng)
+        elif nome in COLUNAS_NLP:
+            colunas[original] = _sortear_textos(amostra[original], n, rng)
+        else:
+            colunas[original] = _sortear_fechadas(amostra[original], n, rng)
+
+    return pd.DataFrame(colunas)
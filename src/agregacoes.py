@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+
+# 🔢 Códigos 0..k-1 na ordem da escala (-1 = vazio ou fora da escala)
+def _codigos_na_escala(serie: pd.Series, escala: list) -> np.ndarray:
+    dtype = serie.dtype
+    if isinstance(dtype, pd.CategoricalDtype) and list(dtype.categories[:len(escala)]) == list(escala):
+        # Schema canônico: a escala é o prefixo das categorias, os códigos já servem
+        codigos = serie.cat.codes.to_numpy()
+        return np.where(codigos < len(escala), codigos, -1)
+
+    return pd.Index(escala).get_indexer(serie)
+
+
+# 📊 Matriz item × nível da escala numa única passada (bincount sobre códigos)
+# `por` (opcional): coluna de agrupamento (curso, turno, semestre...) para comparações
+def contar_likert(df: pd.DataFrame, colunas: list, escala: list, por: str = None) -> pd.DataFrame:
+    itens = [c for c in colunas if c in df.columns]
+    k = len(escala)
+
+    if not itens:
+        return pd.DataFrame(columns=escala, dtype="int64").rename_axis("Item")
+
+    codigos = np.column_stack([_codigos_na_escala(df[c], escala) for c in itens])
+    posicao_item = np.arange(len(itens)) * k
+    validos = codigos >= 0
+
+    if por is None:
+        chaves = (codigos + posicao_item)[validos]
+        contagem = np.bincount(chaves, minlength=len(itens) * k).reshape(len(itens), k)
+        return pd.DataFrame(contagem, index=pd.Index(itens, name="Item"), columns=escala)
+
+    grupos, rotulos = pd.factorize(df[por], sort=True)
+    validos &= (grupos >= 0)[:, None]
+    chaves = (grupos[:, None] * len(itens) * k + codigos + posicao_item)[validos]
+    contagem = np.bincount(chaves, minlength=len(rotulos) * len(itens) * k)
+
+    indice = pd.MultiIndex.from_product([list(rotulos), itens], names=[por, "Item"])
+    return pd.DataFrame(contagem.reshape(len(rotulos) * len(itens), k), index=indice, columns=escala)
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+_locks: dict = {}
+_locks_guard = threading.Lock()
+
+
+# 🔒 Um lock por arquivo, compartilhado pelas threads do processo
+def lock_do_arquivo(path: str) -> threading.Lock:
+    path = os.path.abspath(path)
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = threading.Lock()
+        return lock
+
+
+# 💾 Escrita atômica: temporário exclusivo (mkstemp) no mesmo diretório e
+# os.replace no fim. Leitores nunca veem o arquivo pela metade, e threads ou
+# processos gravando o mesmo destino não sobrescrevem o temporário um do outro
+@contextmanager
+def escrita_atomica(path: str, modo: str = "w"):
+    diretorio = os.path.dirname(path) or "."
+    os.makedirs(diretorio, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=diretorio, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, modo, encoding=None if "b" in modo else "utf-8") as f:
+            yield f
+        # mkstemp cria com 0600; o destino fica legível como um arquivo comum
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,161 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .figuras import figura_escopada, figura_para_png
+from .tracing import span, tracer
+from .utils.helpers import ao_descartar_versao, versao_base
+
+
+# 🧠 LRU limitado e thread-safe, com contadores de acerto/erro
+# max_bytes (opcional): orçamento de memória, medido por len() de cada valor
+class CacheLRU:
+    def __init__(self, max_itens: int, max_bytes: int = None):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._itens: OrderedDict = OrderedDict()
+        self._tamanhos = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, chave):
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.hits += 1
+                return True, self._itens[chave]
+            self.misses += 1
+            return False, None
+
+    def put(self, chave, valor) -> None:
+        tamanho = len(valor) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and tamanho > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remover(chave)
+            self._itens[chave] = valor
+            self._tamanhos[chave] = tamanho
+            self._bytes += tamanho
+            while len(self._itens) > self.max_itens or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remover(next(iter(self._itens)))
+                self.evictions += 1
+
+    def descartar(self, condicao) -> None:
+        with self._lock:
+            for chave in [k for k in self._itens if condicao(k)]:
+                self._remover(chave)
+
+    def _remover(self, chave) -> None:
+        if chave in self._itens:
+            del self._itens[chave]
+            self._bytes -= self._tamanhos.pop(chave)
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# 📊 Agregados dos gráficos por (versão da base, filtros, gráfico, parâmetros)
+cache_agregados = CacheLRU(max_itens=512)
+
+
+def chave_filtro(df: pd.DataFrame):
+    versao = versao_base(df)
+    filtros = df.attrs.get("filtros")
+    if versao is None or filtros is None:
+        return None
+    return versao, filtros
+
+
+# 🎯 Separa cálculo de renderização: a função decorada só agrega, o resultado
+# é compartilhado entre sessões e não deve ser alterado por quem desenha
+def agregado_em_cache(func):
+    @functools.wraps(func)
+    def wrapper(df: pd.DataFrame, *args):
+        chave_df = chave_filtro(df)
+        if chave_df is None:
+            return func(df, *args)
+
+        chave = (chave_df, func.__name__, args)
+        encontrado, valor = cache_agregados.get(chave)
+        if encontrado:
+            return valor
+
+        with span("aggregate", chart=func.__name__):
+            valor = func(df, *args)
+        cache_agregados.put(chave, valor)
+        return valor
+
+    return wrapper
+
+
+# 🖼️ Figuras já renderizadas (PNG ou JSON do Plotly) pelo hash do agregado
+MAX_BYTES_FIGURAS = 64 * 1024 * 1024
+
+cache_figuras = CacheLRU(max_itens=256, max_bytes=MAX_BYTES_FIGURAS)
+
+
+def hash_agregado(dados) -> str:
+    if dados is None:
+        return "vazio"
+    hasher = hashlib.sha1()
+    if isinstance(dados, pd.DataFrame):
+        hasher.update(repr(list(dados.columns)).encode())
+    else:
+        hasher.update(repr(dados.name).encode())
+    hasher.update(pd.util.hash_pandas_object(dados, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def _figura_em_cache(chave, gerar):
+    encontrado, valor = cache_figuras.get(chave)
+    if encontrado:
+        return valor
+    with span("figure_render", chart=chave[0]):
+        valor = gerar()
+    cache_figuras.put(chave, valor)
+    return valor
+
+
+# PNG de uma figura matplotlib; `desenhar(fig)` só roda no miss, numa figura escopada
+def png_em_cache(chave, desenhar, **opcoes_figura) -> bytes:
+    def gerar():
+        with figura_escopada(**opcoes_figura) as fig:
+            desenhar(fig)
+            return figura_para_png(fig)
+
+    return _figura_em_cache(chave, gerar)
+
+
+# JSON de uma figura Plotly; `montar` só roda no miss
+def plotly_em_cache(chave, montar) -> str:
+    return _figura_em_cache(chave, lambda: montar().to_json())
+
+
+def estatisticas_cache() -> dict:
+    return {
+        "agregados": cache_agregados.estatisticas(),
+        "figuras": cache_figuras.estatisticas(),
+    }
+
+
+ao_descartar_versao(lambda versao: cache_agregados.descartar(lambda chave: chave[0][0] == versao))
+
+tracer.register_collector("cache", estatisticas_cache)
@@ -0,0 +1,142 @@
+# 📋 Catálogo das colunas que o dashboard realmente consome
+# (usado pelos gráficos e pela projeção $select do GraphClient)
+
+COLUNA_DATA = "Hora de início"
+COLUNA_CURSO = "Qual o seu Curso?"
+COLUNA_PERIODO = "Qual é o seu período?"
+
+COLUNA_MOTIVOS = "Os motivos de sua escolha pela FECAP"
+COLUNA_EXPECTATIVAS = "Suas expectativas quanto ao Curso escolhido"
+COLUNA_OBJETIVOS = "Seus objetivos profissionais e de vida."
+COLUNA_RECOMENDACAO = "Considerando sua experiência até o momento da matrícula na FECAP, o quanto você nos recomendaria a seus amigos e familiares?"
+COLUNA_JUSTIFICATIVA = "Você pode nos contar o que o(a) levou a atribuir essa nota?"
+
+# 🆔 Identificador estável da resposta (caches por resposta, como o de NLP)
+COLUNAS_ID = ("IDBASE", "ID", "id")
+
+COLUNAS_SATISFACAO = [
+    "Informações da FECAP no Site",
+    "Informações do Curso escolhido no site",
+    "Atendimento Telefônico quando eu liguei para a FECAP",
+    "Atendimento Telefônico quando recebi telefonemas da FECAP",
+    "Atendimento pelo WhatsApp",
+    "Atendimento por Mídias Sociais",
+    "Atendimento por email (sejafecap@fecap.br)",
+    "Visita Guiada pelo Campus",
+    "Ficha de inscrição do processo seletivo (internet)",
+    "Organização da FECAP no dia do Vestibular",
+    "Qualidade da prova de vestibular",
+    "Acesso aos resultados do processo seletivo (aprovação)",
+    "Atendimento na Matrícula",
+    "Atendimento no Departamento Financeiro"
+]
+
+ESCALA_SATISFACAO = [
+    "Não utilizei",
+    "Muito insatisfeito",
+    "Insatisfeito",
+    "Neutro",
+    "Satisfeito",
+    "Muito satisfeito"
+]
+
+COLUNAS_IES = [
+    "USP", "FGV", "Insper", "FAAP", "Mackenzie", "PUC", "FECAP",
+    "FEI", "FIAP", "Anhembi", "FMU", "Uninove", "UNIP", "Anhanguera"
+]
+
+ESCALA_QUALIDADE = [
+    "Não conheço",
+    "Péssima",
+    "Ruim",
+    "Regular",
+    "Ótima",
+    "Excelente"
+]
+
+COLUNAS_INFLUENCIA = [
+    "Proximidade da residência",
+    "Proximidade do trabalho",
+    "Recomendações de amigos",
+    "Recomendações de alunos e ex-alunos",
+    "Recomendações de familiares",
+    "Recomendações de Professores de Ensino Médio-Básico",
+    "Recomendações de Profissionais de Mercado",
+    "Informações no Facebook",
+    "Informações no Instagram",
+    "Informações no Youtube",
+    "Informações no Linkedin",
+    "Corpo Docente (Professores da FECAP)",
+    "Matriz Curricular do Curso",
+    "Resultados no ENADE-MEC",
+    "Resultados em Rankings (ex: Guia da Faculdade)",
+    "Preço do Curso",
+    "Instalações e Infraestrutura",
+    "Serviços de atendimento e recepção",
+    "Prestígio do Curso",
+    "Prestígio da Marca FECAP"
+]
+
+ESCALA_INFLUENCIA = [
+    "Influenciou muito negativamente",
+    "Influenciou negativamente",
+    "Neutro",
+    "Influenciou positivamente",
+    "Influenciou muito positivamente"
+]
+
+# 💰 Faixas de renda na ordem do formulário (espaços já normalizados)
+ESCALA_RENDA_INDIVIDUAL = [
+    "Até 900,60",
+    "De 900,61 a 1.965,87",
+    "De 1.965,88 a 3.276,76",
+    "De 3.276,77 a 5.755,23",
+    "De 5.755,24 a 10.361,48",
+    "De 10.361,49 a 21.826,73",
+    "Acima de 21.826,74"
+]
+
+ESCALA_RENDA_FAMILIAR = [
+    "Até 2.424,00",
+    "De 2.242,01 a 4.484,00",
+    "De 4.484,01 a 12.120,00",
+    "De 12.120,01 a 22.240,00",
+    "Acima de 22.240,01"
+]
+
+COLUNAS_EXATAS = [
+    COLUNA_DATA,
+    COLUNA_CURSO,
+    COLUNA_PERIODO,
+    COLUNA_MOTIVOS,
+    COLUNA_EXPECTATIVAS,
+    COLUNA_OBJETIVOS,
+    COLUNA_RECOMENDACAO,
+    COLUNA_JUSTIFICATIVA,
+    *COLUNAS_INFLUENCIA,
+    *COLUNAS_SATISFACAO,
+    *COLUNAS_IES,
+]
+
+# 🔍 Trechos usados pelos gráficos que localizam a coluna por substring
+PADROES_COLUNAS = [
+    "renda individual",
+    "renda familiar",
+    "nível hierárquico",
+    "primeira experiência",
+    "quais meios",
+    "processo seletivo em quais instituições",
+]
+
+
+def _usada_no_dashboard(coluna: str) -> bool:
+    nome = coluna.strip()
+    if nome in COLUNAS_EXATAS:
+        return True
+
+    return any(padrao in nome.lower() for padrao in PADROES_COLUNAS)
+
+
+# ✅ Filtra as colunas disponíveis (nomes de exibição) para as que os gráficos usam
+def colunas_dashboard(disponiveis) -> list:
+    return [c for c in disponiveis if _usada_no_dashboard(c)]
@@ -0,0 +1,12 @@
+import os
+
+import streamlit as st
+
+
+# ⚙️ Config: secrets do Streamlit; sem secrets.toml (dev local, benchmarks),
+# variáveis de ambiente
+def config(chave: str, padrao=None):
+    try:
+        return st.secrets.get(chave, padrao)
+    except FileNotFoundError:
+        return os.environ.get(chave, padrao)
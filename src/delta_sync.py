@@ -0,0 +1,124 @@
+import json
+import os
+
+import requests
+
+from .arquivos import escrita_atomica, lock_do_arquivo
+from .sharepoint_client import GraphClient
+
+
+# 📁 Onde ficam os snapshots locais da lista (ignorado no git)
+DEFAULT_CACHE_DIR = os.path.join("data", "cache")
+
+# 🧾 Formato do arquivo; snapshots de outro formato são descartados (resync)
+# 2: cada item guarda o próprio "id"
+FORMATO = 2
+
+# Status do Graph que indicam que o deltaLink não serve mais (ou delta indisponível)
+_RESYNC_STATUS = {400, 404, 410, 501}
+
+def _ordem(item_id: str):
+    return (0, int(item_id)) if item_id.isdigit() else (1, item_id)
+
+
+class DeltaSnapshot:
+    def __init__(self, path: str):
+        self.path = path
+        self.delta_link = None
+        self.select = None
+        self.items: dict = {}
+
+    @classmethod
+    def load(cls, path: str) -> "DeltaSnapshot":
+        snapshot = cls(path)
+
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("formato") != FORMATO:
+                    return snapshot
+                snapshot.delta_link = data.get("delta_link")
+                snapshot.select = data.get("select")
+                snapshot.items = data.get("items", {})
+            except (OSError, ValueError):
+                # Snapshot corrompido: recomeça com sincronização completa
+                snapshot = cls(path)
+
+        return snapshot
+
+    def save(self) -> None:
+        with escrita_atomica(self.path) as f:
+            json.dump(
+                {
+                    "formato": FORMATO,
+                    "delta_link": self.delta_link,
+                    "select": self.select,
+                    "items": self.items,
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    def merge(self, changed: dict, removed: set) -> None:
+        for item_id in removed:
+            self.items.pop(item_id, None)
+        self.items.update(changed)
+
+    def rows(self) -> list:
+        return [self.items[k] for k in sorted(self.items, key=_ordem)]
+
+
+def snapshot_path(list_id: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"{list_id}.delta.json")
+
+
+# 🚀 Sincroniza o snapshot local e devolve todas as linhas (mesmo contrato de fetch_list_items)
+# somente_alteracoes: devolve None (sem regravar o snapshot) se o delta não trouxe
+# nada, para o chamador reaproveitar as linhas que já tem
+def sincronizar_itens(
+    client: GraphClient,
+    site_id: str,
+    list_id: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    select: list = None,
+    somente_alteracoes: bool = False,
+) -> list:
+    path = snapshot_path(list_id, cache_dir)
+    select = sorted(select) if select else None
+
+    with lock_do_arquivo(path):
+        snapshot = DeltaSnapshot.load(path)
+
+        # 🎯 Projeção mudou: os itens salvos não têm os mesmos campos
+        if snapshot.select != select:
+            snapshot = DeltaSnapshot(path)
+            snapshot.select = select
+
+        try:
+            changed, removed, delta_link = client.fetch_list_items_delta(
+                site_id, list_id, snapshot.delta_link, select
+            )
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status not in _RESYNC_STATUS:
+                raise
+
+            if snapshot.delta_link is None:
+                # Delta indisponível para esta lista: usa a leitura completa
+                return client.fetch_list_items(site_id, list_id, select)
+
+            # 🔄 deltaLink expirado (410 resyncRequired): sincronização completa
+            snapshot = DeltaSnapshot(path)
+            snapshot.select = select
+            changed, removed, delta_link = client.fetch_list_items_delta(site_id, list_id, select=select)
+
+        # 💤 Sem mudanças desde o último deltaLink (que continua válido)
+        if somente_alteracoes and snapshot.delta_link is not None and not (changed or removed):
+            return None
+
+        snapshot.merge(changed, removed)
+        snapshot.delta_link = delta_link
+        snapshot.save()
+
+        return snapshot.rows()
@@ -0,0 +1,94 @@
+import functools
+import logging
+import time
+
+import pandas as pd
+import streamlit as st
+
+from .configuracao import config
+from .diagnostico import LIMITE_PADRAO, diagnostico
+from .diagnostico import logger as logger_diagnostico
+from .tracing import logger, tracer
+
+
+# ⏱️ Medição de cada rerun do app.py:
+# - TRACING_LOG = true: um JSON por span no stderr
+# - DIAGNOSTICO = "info" | "debug" (padrão "off"), com DIAGNOSTICO_AMOSTRAGEM
+#   (0 a 1) e DIAGNOSTICO_LIMITE (linhas por evento/minuto): eventos no stderr
+# - METRICS_TEXTFILE = "caminho.prom": métricas no formato do Prometheus,
+#   regravadas a cada rerun (textfile collector do node_exporter)
+# - ADMIN_TOKEN: painel de desempenho na sidebar ao abrir o app com ?admin=<token>
+def _log_no_stderr(destino: logging.Logger) -> None:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    destino.addHandler(handler)
+    destino.propagate = False
+
+
+@functools.lru_cache(maxsize=None)
+def _configurar_logs() -> None:
+    if str(config("TRACING_LOG", "")).lower() in ("1", "true", "sim"):
+        _log_no_stderr(logger)
+        logger.setLevel(logging.INFO)
+
+    nivel = str(config("DIAGNOSTICO", "off")).lower()
+    if nivel != "off":
+        diagnostico.configurar(
+            nivel,
+            amostragem=float(config("DIAGNOSTICO_AMOSTRAGEM", 1.0)),
+            limite=int(config("DIAGNOSTICO_LIMITE", LIMITE_PADRAO)),
+        )
+        _log_no_stderr(logger_diagnostico)
+
+
+def iniciar_rerun() -> float:
+    _configurar_logs()
+    tracer.begin_trace()
+    return time.perf_counter()
+
+
+def painel_habilitado() -> bool:
+    token = config("ADMIN_TOKEN")
+    return bool(token) and st.query_params.get("admin") == str(token)
+
+
+def finalizar_rerun(inicio: float) -> None:
+    tracer.observe("rerun", time.perf_counter() - inicio)
+    trace = tracer.end_trace()
+
+    caminho = config("METRICS_TEXTFILE")
+    if caminho:
+        tracer.write_textfile(caminho)
+
+    if painel_habilitado():
+        exibir_painel(trace)
+
+
+# 📊 Este rerun (Graph x pandas x renderização) + acumulado do processo
+def exibir_painel(trace: list) -> None:
+    resumo = tracer.snapshot()
+
+    with st.sidebar.expander("⏱️ Desempenho", expanded=False):
+        if trace:
+            st.caption("Este rerun (ms)")
+            rerun = pd.DataFrame(trace).drop(columns="ts")
+            st.dataframe(rerun, hide_index=True)
+
+        if resumo["spans"]:
+            st.caption("Desde o início do processo (ms)")
+            spans = pd.DataFrame(resumo["spans"]).sort_values("total_ms", ascending=False)
+            st.dataframe(spans.round(1), hide_index=True)
+
+        if resumo["counters"]:
+            st.caption("Contadores")
+            st.dataframe(pd.DataFrame(resumo["counters"]), hide_index=True)
+
+        st.caption("Caches e figuras")
+        st.json(resumo["gauges"], expanded=False)
+
+        st.download_button(
+            "Baixar métricas (Prometheus)",
+            tracer.prometheus_text(),
+            file_name="metricas.prom",
+            mime="text/plain",
+        )
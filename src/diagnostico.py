@@ -0,0 +1,85 @@
+import json
+import logging
+import threading
+import time
+
+
+# 🩺 Diagnóstico estruturado, desligado por padrão (substitui os print/st.write
+# de depuração). Cada evento vira uma linha JSON no logger "src.diagnostico":
+# - nível: "off" (padrão), "info" ou "debug"; eventos acima do nível nem montam payload
+# - amostragem: fração dos eventos registrada (1 a cada round(1 / fração), determinístico)
+# - limite: máximo de linhas por evento a cada minuto; as descartadas são
+#   contadas e informadas em "suprimidos" na próxima linha do mesmo evento
+logger = logging.getLogger(__name__)
+
+NIVEIS = {
+    "off": logging.CRITICAL + 10,
+    "info": logging.INFO,
+    "debug": logging.DEBUG,
+}
+
+JANELA_SEGUNDOS = 60
+LIMITE_PADRAO = 30
+
+
+class Diagnostico:
+    def __init__(self):
+        self.nivel = NIVEIS["off"]
+        self.passo = 1
+        self.limite = LIMITE_PADRAO
+        self._eventos: dict = {}  # evento -> [ocorrências, início da janela, na janela, suprimidos]
+        self._lock = threading.Lock()
+
+    def configurar(self, nivel: str = "off", amostragem: float = 1.0, limite: int = LIMITE_PADRAO) -> None:
+        nivel = str(nivel).lower()
+        if nivel not in NIVEIS:
+            raise ValueError(f"Nível de diagnóstico desconhecido: {nivel}")
+
+        self.nivel = NIVEIS[nivel]
+        self.passo = max(1, round(1 / amostragem)) if amostragem > 0 else 0
+        self.limite = limite
+        logger.setLevel(min(self.nivel, logging.CRITICAL))
+        with self._lock:
+            self._eventos.clear()
+
+    # ⚡ Checagem barata para o chamador evitar montar payloads caros
+    def ativo(self, nivel: str = "debug") -> bool:
+        return self.passo > 0 and NIVEIS[nivel] >= self.nivel
+
+    def _liberar(self, evento: str):
+        agora = time.monotonic()
+        with self._lock:
+            estado = self._eventos.get(evento)
+            if estado is None:
+                estado = self._eventos[evento] = [0, agora, 0, 0]
+
+            estado[0] += 1
+            if (estado[0] - 1) % self.passo:
+                return None  # fora da amostra
+
+            if agora - estado[1] >= JANELA_SEGUNDOS:
+                estado[1], estado[2] = agora, 0
+            if estado[2] >= self.limite:
+                estado[3] += 1
+                return None
+
+            estado[2] += 1
+            suprimidos, estado[3] = estado[3], 0
+            return suprimidos
+
+    def registrar(self, evento: str, nivel: str = "debug", **dados) -> None:
+        if not self.ativo(nivel):
+            return
+
+        suprimidos = self._liberar(evento)
+        if suprimidos is None:
+            return
+
+        registro = {"evento": evento, "ts": round(time.time(), 3), **dados}
+        if suprimidos:
+            registro["suprimidos"] = suprimidos
+
+        logger.log(NIVEIS[nivel], json.dumps(registro, ensure_ascii=False, default=str))
+
+
+diagnostico = Diagnostico()
@@ -0,0 +1,51 @@
+import io
+import sys
+import threading
+from contextlib import contextmanager
+
+from .tracing import tracer
+
+
+# 🖌️ Figuras matplotlib fora do registro global do pyplot: cada uma pertence só
+# ao bloco que a criou (seguro entre as threads de sessão do Streamlit) e é
+# liberada ao sair do bloco
+_vivas = 0
+_lock = threading.Lock()
+
+
+@contextmanager
+def figura_escopada(**opcoes):
+    global _vivas
+
+    from matplotlib.figure import Figure
+
+    fig = Figure(**opcoes)
+    with _lock:
+        _vivas += 1
+    try:
+        yield fig
+    finally:
+        fig.clear()
+        with _lock:
+            _vivas -= 1
+
+
+# Mesmo savefig do st.pyplot
+def figura_para_png(fig) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    return buffer.getvalue()
+
+
+# 📈 Figuras abertas agora: escopadas e (se o pyplot foi carregado) no registro global
+def figuras_vivas() -> dict:
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    with _lock:
+        escopadas = _vivas
+    return {
+        "escopadas": escopadas,
+        "pyplot": len(pyplot.get_fignums()) if pyplot is not None else 0,
+    }
+
+
+tracer.register_collector("figuras", figuras_vivas)
@@ -0,0 +1,93 @@
+import os
+import time
+
+import pandas as pd
+
+from .colunas import COLUNA_RECOMENDACAO, COLUNAS_ID, colunas_dashboard
+from .sharepoint_client import normalize_names
+
+
+# 📂 Fontes locais da base (sem rede): CSV exportado do Forms/SharePoint e Parquet
+CAMINHO_CSV_PADRAO = os.path.join("data", "ingressantes_atualizado.csv")
+
+
+def _engine_csv() -> str:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "c"
+    return "pyarrow"
+
+
+# 🎯 Colunas do arquivo (nomes originais) que o dashboard consome, já mapeadas
+# para o nome normalizado, mais o ID da resposta; dados pessoais (nome, e-mail, celular, RA) ficam de fora
+def _projecao(originais) -> dict:
+    nomes = normalize_names(originais)
+    usadas = set(colunas_dashboard(nomes)) | set(COLUNAS_ID)
+    return {original: nome for original, nome in zip(originais, nomes) if nome in usadas}
+
+
+# ⚡ Leitura enxuta: BOM tratado (utf-8-sig), só as colunas usadas, tipos
+# explícitos (texto como str, NPS como Int8) e engine pyarrow quando disponível
+def ler_csv(caminho: str) -> pd.DataFrame:
+    cabecalho = pd.read_csv(caminho, nrows=0, encoding="utf-8-sig").columns
+    projecao = _projecao(cabecalho)
+
+    tipos = {
+        original: "Int8" if nome == COLUNA_RECOMENDACAO else "str"
+        for original, nome in projecao.items()
+    }
+
+    df = pd.read_csv(
+        caminho,
+        encoding="utf-8-sig",
+        usecols=list(projecao),
+        dtype=tipos,
+        engine=_engine_csv(),
+    )
+    return df.rename(columns=projecao)
+
+
+def ler_parquet(caminho: str) -> pd.DataFrame:
+    try:
+        import pyarrow.parquet as pq
+
+        colunas = list(_projecao(pq.read_schema(caminho).names))
+    except ImportError:
+        colunas = None
+
+    df = pd.read_parquet(caminho, columns=colunas)
+    return df.rename(columns=dict(zip(df.columns, normalize_names(df.columns))))
+
+
+LEITORES = {
+    "csv": ler_csv,
+    "parquet": ler_parquet,
+}
+
+
+# 🗂️ Fonte local: relê o arquivo só quando ele muda (mtime)
+class FonteArquivo:
+    def __init__(self, tipo: str, caminho: str, preparar=None):
+        if tipo not in LEITORES:
+            raise ValueError(f"Fonte de dados desconhecida: {tipo}")
+
+        self.nome = tipo
+        self.caminho = caminho
+        self.preparar = preparar
+        self._mtime = None
+        self._df = None
+
+    # -> (DataFrame, momento da leitura em epoch), mesmo contrato do RefreshScheduler
+    def carregar(self):
+        mtime = os.path.getmtime(self.caminho)
+        if self._df is None or mtime != self._mtime:
+            df = LEITORES[self.nome](self.caminho)
+            if self.preparar is not None:
+                df = self.preparar(df)
+            self._df, self._mtime = df, mtime
+
+        return self._df, time.time()
+
+    def inicial(self):
+        return None, None
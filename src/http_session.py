@@ -0,0 +1,66 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# ⚙️ Padrões da camada HTTP (podem ser sobrescritos via secrets)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (5, 60)  # (conexão, leitura) em segundos
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_sessions: dict = {}
+_lock = threading.Lock()
+
+
+def _build_session(pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+    # 🔁 Backoff exponencial; Retry-After do Graph (429/503) tem prioridade
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# 🔌 Sessão keep-alive compartilhada pelo processo (uma por configuração)
+def get_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+) -> requests.Session:
+    key = (pool_size, max_retries, backoff_factor)
+
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session(pool_size, max_retries, backoff_factor)
+            _sessions[key] = session
+
+    return session
+
+
+def close_sessions() -> None:
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .preprocess_text import tokenizar
+from .utils.helpers import ao_descartar_versao, base_completa, versao_base
+
+
+# 📚 Matriz documento × termo (esparsa) de uma pergunta aberta: uma linha por
+# resposta da base, uma coluna por palavra do vocabulário
+class IndiceTermos:
+    def __init__(self, df: pd.DataFrame, coluna: str, tipo: str):
+        from scipy import sparse
+
+        self.index = df.index
+        palavras = tokenizar(df[coluna], tipo)
+
+        codigos, vocabulario = pd.factorize(palavras, sort=False)
+        linhas = self.index.get_indexer(palavras.index)
+        dados = np.ones(len(codigos), dtype=np.int32)
+
+        # Entradas repetidas (mesma palavra na mesma resposta) são somadas
+        self.matriz = sparse.csr_matrix(
+            (dados, (linhas, codigos)), shape=(len(df), len(vocabulario))
+        )
+        self.vocabulario = pd.Index(vocabulario, dtype=object)
+        self.total = np.asarray(self.matriz.sum(axis=0)).ravel()
+
+    # 🎯 Frequência dos termos no recorte: soma só as linhas selecionadas
+    def frequencias(self, df: pd.DataFrame) -> pd.Series:
+        if len(df) == len(self.index):
+            contagem = self.total
+        else:
+            posicoes = self.index.get_indexer(df.index)
+            posicoes = posicoes[posicoes >= 0]
+            contagem = np.asarray(self.matriz[posicoes].sum(axis=0)).ravel()
+
+        ordem = np.argsort(-contagem, kind="stable")
+        ordem = ordem[contagem[ordem] > 0]
+        return pd.Series(contagem[ordem], index=self.vocabulario[ordem], name="count")
+
+
+_indices: dict = {}
+_lock = threading.Lock()
+
+
+# 📥 Índice da pergunta montado uma vez por versão da base (o filtro só escolhe linhas)
+def indice_termos(df: pd.DataFrame, coluna: str, tipo: str) -> IndiceTermos:
+    base = base_completa(df)
+    if base is None or not base.index.is_unique:
+        return IndiceTermos(df, coluna, tipo)
+
+    chave = (versao_base(df), coluna, tipo)
+    with _lock:
+        indice = _indices.get(chave)
+
+    if indice is None:
+        indice = IndiceTermos(base, coluna, tipo)
+        with _lock:
+            _indices[chave] = indice
+
+    return indice
+
+
+def frequencia_termos(df: pd.DataFrame, coluna: str, tipo: str) -> pd.Series:
+    return indice_termos(df, coluna, tipo).frequencias(df)
+
+
+def _descartar(versao) -> None:
+    with _lock:
+        for chave in [k for k in _indices if k[0] == versao]:
+            del _indices[chave]
+
+
+ao_descartar_versao(_descartar)
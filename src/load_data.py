@@ -1,80 +1,468 @@
+import hashlib
+import json
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-from .sharepoint_client import GraphClient, normalize_columns
+from .colunas import (
+    COLUNA_CURSO,
+    COLUNA_DATA,
+    COLUNA_PERIODO,
+    COLUNA_RECOMENDACAO,
+    COLUNAS_EXATAS,
+    COLUNAS_IES,
+    COLUNAS_INFLUENCIA,
+    COLUNAS_SATISFACAO,
+    ESCALA_INFLUENCIA,
+    ESCALA_QUALIDADE,
+    ESCALA_RENDA_FAMILIAR,
+    ESCALA_RENDA_INDIVIDUAL,
+    ESCALA_SATISFACAO,
+    PADROES_COLUNAS,
+    colunas_dashboard,
+)
+from .configuracao import config
+from .delta_sync import DEFAULT_CACHE_DIR, sincronizar_itens
+from .diagnostico import diagnostico
+from .fontes_dados import CAMINHO_CSV_PADRAO, FonteArquivo, ler_csv
+from .http_session import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+)
+from .nlp_textos import agendar_processamento
+from .refresh import RefreshScheduler
+from .snapshot_store import carregar_snapshot, salvar_snapshot
+from .sharepoint_client import (
+    DEFAULT_AUTHORITY,
+    DEFAULT_BASE_URL,
+    DEFAULT_PAGE_SIZE,
+    GraphClient,
+    filtro_periodo,
+    frames_to_dataframe,
+    iter_row_frames,
+    normalize_columns,
+)
+from .token_cache import token_cache
+from .tracing import span
+from .utils.helpers import registrar_base
 
 
 # 🔐 Cria o client com base no secrets do Streamlit
 def _client_from_secrets() -> GraphClient:
     s = st.secrets
+    token_cache.background_refresh = bool(s.get("GRAPH_TOKEN_BACKGROUND_REFRESH", False))
+
     return GraphClient(
         tenant_id=s["GRAPH_TENANT_ID"],
         client_id=s["GRAPH_CLIENT_ID"],
         client_secret=s["GRAPH_CLIENT_SECRET"],
+        pool_size=int(s.get("GRAPH_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        timeout=(DEFAULT_TIMEOUT[0], float(s.get("GRAPH_TIMEOUT", DEFAULT_TIMEOUT[1]))),
+        max_retries=int(s.get("GRAPH_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        backoff_factor=float(s.get("GRAPH_BACKOFF_FACTOR", DEFAULT_BACKOFF_FACTOR)),
+        page_size=int(s.get("GRAPH_PAGE_SIZE", DEFAULT_PAGE_SIZE)),
+        prefetch=bool(s.get("GRAPH_PREFETCH", True)),
+        base_url=s.get("GRAPH_BASE_URL", DEFAULT_BASE_URL),
+        authority=s.get("GRAPH_AUTHORITY", DEFAULT_AUTHORITY),
     )
 
 
-# 🚀 Função principal que carrega do SharePoint
-@st.cache_data(ttl=60 * 15)
-def carregar_sharepoint() -> pd.DataFrame:
-    try:
-        # 🔹 CONFIG CORRETA DO SEU SHAREPOINT
-        hostname = "edufecap.sharepoint.com"
-        site_path = "/sites/IngressantesFECAP"
-        list_name = "2024_1 Pesquisa com Ingressantes da GraduaoFECAP"
+# 🎯 Projeção ($select) e filtro ($filter) enviados ao Graph
+def _consulta_graph(client: GraphClient, site_id: str, list_id: str):
+    s = st.secrets
+    select, renomear, filtro = None, {}, s.get("GRAPH_FILTER")
+    projetar = s.get("GRAPH_SELECT_COLUMNS", True)
+
+    # 📅 Recorte opcional por "Hora de início" (datas ISO, ex.: 2024-01-01)
+    inicio, fim = s.get("GRAPH_DATA_INICIO"), s.get("GRAPH_DATA_FIM")
+    filtrar_data = not filtro and (inicio or fim)
+
+    if not (projetar or filtrar_data):
+        return select, renomear, filtro
 
-        client = _client_from_secrets()
+    mapa = client.get_list_columns(site_id, list_id)
 
-        site_id = client.get_site_id(hostname, site_path)
-        list_id = client.get_list_id_by_name(site_id, list_name)
+    if projetar:
+        usadas = colunas_dashboard(mapa)
+        if usadas:
+            select = [mapa[c] for c in usadas]
+            renomear = {mapa[c]: c for c in usadas if mapa[c] != c}
 
-        rows = client.fetch_list_items(site_id, list_id)
+    if filtrar_data:
+        filtro = filtro_periodo(mapa.get(COLUNA_DATA, COLUNA_DATA), inicio, fim)
 
-        # ⚠️ Se não vier nada
-        if not rows:
-            st.warning("Nenhum dado retornado da lista do SharePoint.")
-            return pd.DataFrame()
+    return select, renomear, filtro
 
-        df = pd.DataFrame(rows)
 
-        # 🔧 Normaliza colunas
-        df = normalize_columns(df)
+# 🧬 Schema canônico: escalas Likert/renda como Categorical ordenado, NPS inteiro
+def _escalas_do_schema(df: pd.DataFrame) -> dict:
+    escalas = {}
 
-        # 🔍 DEBUG (MUITO IMPORTANTE)
-        st.write("🔎 COLUNAS NORMALIZADAS:")
-        st.write(df.columns.tolist())
+    for coluna in COLUNAS_INFLUENCIA:
+        escalas[coluna] = ESCALA_INFLUENCIA
+    for coluna in COLUNAS_SATISFACAO:
+        escalas[coluna] = ESCALA_SATISFACAO
+    for coluna in COLUNAS_IES:
+        escalas[coluna] = ESCALA_QUALIDADE
 
-        # 🔐 Garante colunas mínimas (evita quebra do app)
-        colunas_esperadas = [
-            "Hora de início",
-            "Qual o seu Curso?",
-            "Qual é o seu período?"
-        ]
+    for coluna in df.columns:
+        if "renda individual" in coluna.lower():
+            escalas[coluna] = ESCALA_RENDA_INDIVIDUAL
+        elif "renda familiar" in coluna.lower():
+            escalas[coluna] = ESCALA_RENDA_FAMILIAR
 
-        for col in colunas_esperadas:
-            if col not in df.columns:
-                df[col] = pd.NA
+    # Curso e turno: poucas categorias, sem ordem
+    escalas[COLUNA_CURSO] = None
+    escalas[COLUNA_PERIODO] = None
 
-        # 📅 Conversão de data
-        if "Hora de início" in df.columns:
-            df["Hora de início"] = pd.to_datetime(
-                df["Hora de início"],
-                errors="coerce",
-                dayfirst=True
-            )
+    return {coluna: escala for coluna, escala in escalas.items() if coluna in df.columns}
 
+
+def _como_categoria(serie: pd.Series, escala) -> pd.Series:
+    # Formulários exportados misturam espaço comum e não separável (\xa0)
+    valores = serie.astype("string").str.replace("\xa0", " ", regex=False).str.strip()
+
+    if escala is None:
+        return valores.astype("category")
+
+    # Valores fora da escala entram no fim (nenhuma resposta é perdida)
+    extras = sorted(set(valores.dropna().unique()) - set(escala))
+    tipo = pd.CategoricalDtype(list(escala) + extras, ordered=True)
+    return valores.astype(tipo)
+
+
+def aplicar_schema(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
         return df
 
-    except Exception as e:
-        st.error(f"Erro ao carregar dados do SharePoint: {e}")
+    for coluna, escala in _escalas_do_schema(df).items():
+        if not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            df[coluna] = _como_categoria(df[coluna], escala)
+
+    # NPS (0 a 10) cabe em Int8
+    if COLUNA_RECOMENDACAO in df.columns and df[COLUNA_RECOMENDACAO].dtype != "Int8":
+        df[COLUNA_RECOMENDACAO] = pd.to_numeric(df[COLUNA_RECOMENDACAO], errors="coerce").astype("Int8")
+
+    return df
+
+
+# 📅 Período letivo: por padrão o 2º semestre começa em 1º de julho
+CORTE_SEMESTRE = (7, 1)
+COLUNA_SEMESTRE = "Semestre"
+COLUNA_ANO_LETIVO = "Ano Letivo"
+
+
+def _corte_configurado():
+    corte = config("SEMESTRE_CORTE")  # "MM-DD"
+    if not corte:
+        return CORTE_SEMESTRE
+    mes, dia = corte.split("-")
+    return int(mes), int(dia)
+
+
+# 📆 Tabela no secrets.toml; na variável de ambiente, JSON ('{"2024-2": "2024-07-15"}')
+def _calendario_configurado():
+    calendario = config("CALENDARIO_ACADEMICO")
+    if isinstance(calendario, str):
+        if not calendario.strip():
+            return None
+        try:
+            calendario = json.loads(calendario)
+        except ValueError as e:
+            raise ValueError(f"CALENDARIO_ACADEMICO não é um JSON válido: {e}") from e
+
+    if calendario is None:
+        return None
+    if not isinstance(calendario, Mapping):
+        raise ValueError("CALENDARIO_ACADEMICO deve mapear período -> data de início.")
+    return dict(calendario)
+
+
+# 🗓️ Vetorizado: cada resposta recebe o semestre ("2024-1") e o ano letivo.
+# `calendario` opcional mapeia rótulo -> data de início (ex.: {"2024-2": "2024-07-15"})
+def derivar_periodos_letivos(df: pd.DataFrame, corte=CORTE_SEMESTRE, calendario: dict = None) -> pd.DataFrame:
+    if df.empty or COLUNA_DATA not in df.columns:
+        return df
+
+    datas = df[COLUNA_DATA]
+    if not pd.api.types.is_datetime64_any_dtype(datas):
+        datas = pd.to_datetime(datas, errors="coerce", dayfirst=True)
+    validas = datas.notna().to_numpy()
+
+    if calendario:
+        # Cada data cai no último período cujo início é <= data
+        inicios = sorted((pd.Timestamp(inicio), rotulo) for rotulo, inicio in calendario.items())
+        rotulos = [rotulo for _, rotulo in inicios]
+        limites = np.array([inicio.to_datetime64() for inicio, _ in inicios], dtype="datetime64[ns]")
+
+        pos = np.searchsorted(limites, datas.to_numpy(dtype="datetime64[ns]"), side="right") - 1
+        codigos = np.where(validas & (pos >= 0), pos, -1)
+    else:
+        mes, dia = corte
+        ano = datas.dt.year.to_numpy(dtype="float64", na_value=np.nan)
+        segundo = ((datas.dt.month > mes) | ((datas.dt.month == mes) & (datas.dt.day >= dia))).to_numpy()
+
+        # Chave inteira ordenável (ano * 2 + semestre - 1) -> códigos de categoria
+        chave = np.where(validas, np.nan_to_num(ano) * 2 + segundo, -1).astype(np.int64)
+        unicas = np.unique(chave[chave >= 0])
+        rotulos = [f"{k // 2}-{k % 2 + 1}" for k in unicas]
+        codigos = np.where(chave >= 0, np.searchsorted(unicas, chave), -1)
+
+    # Ano letivo sai do rótulo ("2024-2" -> 2024), um valor por categoria
+    anos = pd.array([int(r[:4]) if str(r)[:4].isdigit() else None for r in rotulos], dtype="Int16")
+
+    semestres = pd.Categorical.from_codes(codigos, categories=rotulos, ordered=True)
+    ano_letivo = anos.take(codigos, allow_fill=True)
+
+    df[COLUNA_SEMESTRE] = semestres
+    df[COLUNA_ANO_LETIVO] = ano_letivo
+    return df
+
+
+# 🧩 Schema + colunas derivadas, aplicados na carga do Graph e do snapshot
+def _preparar(df: pd.DataFrame) -> pd.DataFrame:
+    df = aplicar_schema(df)
+    return derivar_periodos_letivos(
+        df,
+        corte=_corte_configurado(),
+        calendario=_calendario_configurado(),
+    )
+
+
+# 🔹 CONFIG CORRETA DO SEU SHAREPOINT
+HOSTNAME = "edufecap.sharepoint.com"
+SITE_PATH = "/sites/IngressantesFECAP"
+LIST_NAME = "2024_1 Pesquisa com Ingressantes da GraduaoFECAP"
+
+# 💾 Snapshot local do DataFrame normalizado (sobrevive a restart/deploy)
+SNAPSHOT_NOME = "ingressantes_sharepoint"
+SNAPSHOT_ORIGEM = f"{HOSTNAME}{SITE_PATH}/{LIST_NAME}"
+TTL_SEGUNDOS = 60 * 15
+
+# 🧬 Schema do snapshot: muda com as colunas/escalas usadas pelo dashboard;
+# incrementar SCHEMA_VERSAO quando a normalização ou as colunas derivadas mudarem
+SCHEMA_VERSAO = 2
+
+
+def _schema_snapshot() -> str:
+    definicao = (
+        SCHEMA_VERSAO,
+        COLUNAS_EXATAS,
+        PADROES_COLUNAS,
+        COLUNAS_INFLUENCIA,
+        COLUNAS_SATISFACAO,
+        COLUNAS_IES,
+        ESCALA_INFLUENCIA,
+        ESCALA_SATISFACAO,
+        ESCALA_QUALIDADE,
+        ESCALA_RENDA_INDIVIDUAL,
+        ESCALA_RENDA_FAMILIAR,
+    )
+    return hashlib.sha1(repr(definicao).encode("utf-8")).hexdigest()
+
+
+def _cache_dir() -> str:
+    return config("CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+# 🌐 Baixa a lista do Graph e devolve (DataFrame normalizado, list_id);
+# no modo delta sem mudanças, devolve o próprio `atual`
+def _baixar_sharepoint(atual: pd.DataFrame = None):
+    client = _client_from_secrets()
+
+    site_id = client.get_site_id(HOSTNAME, SITE_PATH)
+    list_id = client.get_list_id_by_name(site_id, LIST_NAME)
+
+    select, renomear, filtro = _consulta_graph(client, site_id, list_id)
+
+    # 🔁 Modo delta (padrão): só baixa o que mudou desde a última sincronização
+    # (o endpoint delta não aceita $filter, então filtro usa a leitura completa)
+    if st.secrets.get("GRAPH_SYNC_MODE", "delta") == "delta" and not filtro:
+        rows = sincronizar_itens(
+            client,
+            site_id,
+            list_id,
+            cache_dir=_cache_dir(),
+            select=select,
+            somente_alteracoes=atual is not None,
+        )
+        if rows is None:
+            return atual, list_id
+
+        # 🧱 Mesmo builder da leitura completa: blocos de uma página, um concat no final
+        df = frames_to_dataframe(iter_row_frames(rows, client.page_size or DEFAULT_PAGE_SIZE))
+        del rows
+    else:
+        # 🧱 Leitura completa em streaming: cada página vira um bloco do DataFrame
+        df = client.fetch_list_frame(site_id, list_id, select, filtro)
+
+    if df.empty:
+        return df, list_id
+
+    # 🏷️ Nomes internos do SharePoint -> nomes de exibição
+    if renomear:
+        df = df.rename(columns=renomear)
+
+    return _normalizar_base(df), list_id
+
+
+# 🧽 Mesmo schema para todas as fontes (Graph, CSV, Parquet)
+@span("dataframe_build")
+def _normalizar_base(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+
+    # 🔧 Normaliza colunas
+    df = normalize_columns(df)
+
+    # 🔐 Garante colunas mínimas (evita quebra do app)
+    colunas_esperadas = [
+        "Hora de início",
+        "Qual o seu Curso?",
+        "Qual é o seu período?"
+    ]
+
+    for col in colunas_esperadas:
+        if col not in df.columns:
+            df[col] = pd.NA
+
+    # 📅 Conversão de data
+    if "Hora de início" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["Hora de início"]):
+        df["Hora de início"] = pd.to_datetime(
+            df["Hora de início"],
+            errors="coerce",
+            dayfirst=True
+        )
+
+    return _preparar(df)
+
+
+# 🌐 Carga completa: baixa do Graph e grava o snapshot em disco
+def _carregar_graph(atual: pd.DataFrame = None):
+    df, list_id = _baixar_sharepoint(atual)
+    if df.empty:
+        return df, None
+
+    # Nada mudou: mesmo objeto (o agendador mantém a versão e os caches) e o
+    # snapshot em disco continua valendo
+    if df is atual:
+        return df, time.time()
+
+    meta = salvar_snapshot(
+        df,
+        SNAPSHOT_NOME,
+        list_id,
+        _cache_dir(),
+        origem=SNAPSHOT_ORIGEM,
+        schema=_schema_snapshot(),
+    )
+    return df, _epoch(meta)
+
+
+# ⚡ Carga inicial a partir do snapshot em disco (se existir)
+def _carregar_snapshot():
+    df, meta = carregar_snapshot(
+        SNAPSHOT_NOME,
+        _cache_dir(),
+        origem=SNAPSHOT_ORIGEM,
+        schema=_schema_snapshot(),
+    )
+    if df is None:
+        return None, None
+    return _preparar(df), _epoch(meta)
+
+
+def _epoch(meta: dict) -> float:
+    return datetime.fromisoformat(meta["fetched_at"]).timestamp()
+
+
+# 🌐 SharePoint via Graph, com snapshot local para o primeiro carregamento;
+# guarda o último DataFrame entregue para o delta sem mudanças reaproveitá-lo
+class FonteSharePoint:
+    nome = "graph"
+
+    def __init__(self):
+        self._df = None
+
+    def carregar(self):
+        df, fetched_at = _carregar_graph(self._df)
+        if not df.empty:
+            self._df = df
+        return df, fetched_at
+
+    def inicial(self):
+        df, fetched_at = _carregar_snapshot()
+        self._df = df
+        return df, fetched_at
+
+
+# 🔌 Fonte escolhida por config: FONTE_DADOS = "sharepoint" (padrão), "csv" ou "parquet";
+# CAMINHO_DADOS aponta o arquivo das fontes locais
+def _fonte():
+    tipo = str(config("FONTE_DADOS", "sharepoint")).lower()
+    if tipo == "sharepoint":
+        return FonteSharePoint()
+
+    caminho = config("CAMINHO_DADOS", CAMINHO_CSV_PADRAO if tipo == "csv" else None)
+    if not caminho:
+        raise ValueError(f"CAMINHO_DADOS não configurado para a fonte '{tipo}'.")
+    return FonteArquivo(tipo, caminho, preparar=_normalizar_base)
+
+
+# 🔄 Um agendador por processo, compartilhado entre as sessões
+@st.cache_resource
+def _agendador() -> RefreshScheduler:
+    fonte = _fonte()
+    return RefreshScheduler(fonte.carregar, ttl=TTL_SEGUNDOS, initial=fonte.inicial, source=fonte.nome)
+
+
+# 📊 Idade dos dados, atualização em andamento e último erro
+def status_dados() -> dict:
+    return _agendador().status()
+
+
+# 🚀 Função principal: carrega da fonte configurada (SharePoint por padrão)
+def carregar_dados() -> pd.DataFrame:
+    agendador = _agendador()
+    df = agendador.get()
+
+    if df is None:
+        erro = agendador.status()["last_error"]
+        st.error(f"Erro ao carregar dados ({agendador.source}): {erro}")
         return pd.DataFrame()
 
+    if diagnostico.ativo("debug"):
+        diagnostico.registrar("colunas_normalizadas", versao=df.attrs.get("versao"), colunas=df.columns.tolist())
+
+    # 🗃️ Tabelas derivadas (múltipla escolha etc.) são montadas sobre esta versão
+    registrar_base(df)
+
+    # 🧠 Lemas/expressões das respostas abertas: só as novas, em segundo plano
+    agendar_processamento(df, _cache_dir())
 
-# 📁 (opcional) fallback local
-def carregar_csv(caminho: str = "data/ingressantes.csv") -> pd.DataFrame:
+    # ⚠️ Mesmo DataFrame para todas as sessões: tratar como somente leitura
+    return df
+
+
+# 🗄️ Base para scripts fora do app (ex.: python -m src.nlp_textos): snapshot
+# em disco ou, sem ele, uma leitura da fonte configurada
+def carregar_base() -> pd.DataFrame:
+    fonte = _fonte()
+    df, _ = fonte.inicial()
+    if df is None:
+        df, _ = fonte.carregar()
+    return df
+
+
+# 📁 Leitura avulsa do CSV local, já no schema normalizado
+def carregar_csv(caminho: str = CAMINHO_CSV_PADRAO) -> pd.DataFrame:
     try:
-        df = pd.read_csv(caminho)
-        df = normalize_columns(df)
-        return df
+        return _normalizar_base(ler_csv(caminho))
     except Exception as e:
         st.error(f"Erro ao carregar CSV: {e}")
         return pd.DataFrame()
@@ -0,0 +1,129 @@
+import threading
+
+import pandas as pd
+
+from .utils.helpers import ao_descartar_versao, base_completa, recortar_por_linhas, versao_base
+
+
+# 🧭 Categorias das perguntas de múltipla escolha (compartilhadas por gráficos e filtros)
+CATEGORIAS_CANAIS = {
+    "Indicação": ["família", "amigos", "professores de ensino médio", "professores de cursinho", "profissionais de mercado"],
+    "Pesquisa Online": ["pesquisa na internet (google)", "site da fecap"],
+    "Redes Sociais": ["facebook", "instagram", "youtube", "twitter", "linkedin"],
+    "Comunicação": ["anúncio na rádio", "anúncios no metrô", "e-mails de divulgação"],
+    "Eventos": ["eventos no seu colégio", "feiras estudantis"],
+    "Reputação/Ranking": ["rankings especializados (ex.: guia da faculdade)", "matérias na imprensa"],
+    "Programas Públicos": ["prouni"],
+    "Convênios": ["trabalho na instituição", "convênio com a aasp (oab)", "convênio com empresa em que eu trabalho"]
+}
+
+CATEGORIAS_INSTITUICOES = {
+    "Federais": ["Federais (SISU)"],
+    "Estaduais": ["USP (Fuvest)", "Unesp", "Unicamp"],
+    "Privadas": [
+        "FGV", "Insper", "FAAP", "Mackenzie", "PUC", "FEI", "FIAP",
+        "Anhembi", "FMU", "Uninove", "UNIP", "Anhanguera", "São Judas", "Unicid"
+    ],
+    "Não prestou": ["Não Prestei Processo Seletivo em Outra Instituição"],
+    "Outro": ["Outro"]
+}
+
+# padrao: trecho do nome da coluna; minusculas: comparação sem diferenciar maiúsculas
+PERGUNTAS = {
+    "canais": {
+        "padrao": "quais meios",
+        "categorias": CATEGORIAS_CANAIS,
+        "minusculas": True,
+        "outros": "Outros",
+    },
+    "instituicoes": {
+        "padrao": "processo seletivo em quais instituições",
+        "categorias": CATEGORIAS_INSTITUICOES,
+        "minusculas": False,
+        "outros": "Outro",
+    },
+}
+
+_tabelas: dict = {}
+_lock = threading.Lock()
+
+
+def coluna_da_pergunta(df: pd.DataFrame, pergunta: str):
+    padrao = PERGUNTAS[pergunta]["padrao"]
+    colunas = [c for c in df.columns if padrao in c.lower()]
+    return colunas[0] if colunas else None
+
+
+# ✂️ Aceita "a;b;" e listas literais '["a","b"]' numa única passada vetorizada
+def separar_itens(respostas: pd.Series) -> pd.Series:
+    texto = respostas.dropna().astype(str).str.replace("\xa0", " ", regex=False).str.strip()
+
+    lista = texto.str.startswith("[") & texto.str.endswith("]")
+    texto = texto.where(~lista, texto.str.slice(1, -1).str.replace(r"[\"']\s*,\s*[\"']", ";", regex=True))
+
+    itens = texto.str.split(";").explode()
+    itens = itens.str.strip().str.strip("\"'[]").str.strip()
+    return itens[itens.notna() & (itens != "")]
+
+
+# 🧱 Tabela longa: uma linha por item marcado (linha da resposta, item, categoria)
+def construir_tabela(df: pd.DataFrame, pergunta: str):
+    coluna = coluna_da_pergunta(df, pergunta)
+    if coluna is None:
+        return None
+
+    spec = PERGUNTAS[pergunta]
+    itens = separar_itens(df[coluna])
+    if spec["minusculas"]:
+        itens = itens.str.lower()
+
+    termo_para_categoria = {
+        termo: categoria
+        for categoria, termos in spec["categorias"].items()
+        for termo in termos
+    }
+    categorias = itens.map(termo_para_categoria).fillna(spec["outros"])
+    ordem_categorias = list(dict.fromkeys([*spec["categorias"], spec["outros"]]))
+
+    return pd.DataFrame({
+        "linha": itens.index,
+        "item": pd.Categorical(itens),
+        "categoria": pd.Categorical(categorias, categories=ordem_categorias),
+    })
+
+
+# 📥 Tabela da pergunta para o recorte atual (montada uma vez por versão da base)
+def tabela_longa(df: pd.DataFrame, pergunta: str):
+    base = base_completa(df)
+    if base is None:
+        return construir_tabela(df, pergunta)
+
+    chave = (versao_base(df), pergunta)
+    with _lock:
+        tabela = _tabelas.get(chave)
+
+    if tabela is None:
+        tabela = construir_tabela(base, pergunta)
+        with _lock:
+            _tabelas[chave] = tabela
+
+    if tabela is None:
+        return None
+    return recortar_por_linhas(tabela, df, base)
+
+
+def categorias_presentes(df: pd.DataFrame, pergunta: str) -> list:
+    tabela = tabela_longa(df, pergunta)
+    if tabela is None:
+        return []
+    contagem = tabela.groupby("categoria", observed=True).size()
+    return [c for c in PERGUNTAS[pergunta]["categorias"] if contagem.get(c, 0) > 0]
+
+
+def _descartar(versao) -> None:
+    with _lock:
+        for chave in [k for k in _tabelas if k[0] == versao]:
+            del _tabelas[chave]
+
+
+ao_descartar_versao(_descartar)
@@ -0,0 +1,324 @@
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import Counter
+
+import pandas as pd
+
+from .arquivos import escrita_atomica
+from .colunas import COLUNA_EXPECTATIVAS, COLUNA_JUSTIFICATIVA, COLUNA_MOTIVOS, COLUNA_OBJETIVOS, COLUNAS_ID
+from .configuracao import config
+from .delta_sync import DEFAULT_CACHE_DIR
+from .preprocess_text import dobrar, palavras_descartadas, tipo_da_coluna
+from .utils.helpers import versao_base
+
+
+# 🧠 Etapa de NLP (spaCy, opcional): lemas e expressões de 2-3 palavras das
+# perguntas abertas, processadas em lote e guardadas por resposta em data/cache.
+# Reprocessamento offline (vários processos), com a mesma fonte e cache do app:
+#
+#   python -m src.nlp_textos --processos 4
+MODELO_PADRAO = "pt_core_news_sm"
+
+COLUNAS_NLP = [
+    COLUNA_MOTIVOS,
+    COLUNA_EXPECTATIVAS,
+    COLUNA_OBJETIVOS,
+    COLUNA_JUSTIFICATIVA,
+]
+
+TAMANHO_LOTE = 256
+TAMANHOS_NGRAMA = (2, 3)
+
+# nlp.pipe com vários processos só compensa em volumes maiores, e só é seguro
+# chamado da thread principal de um script (o comando offline acima): o
+# processamento agendado pelo app roda numa thread e usa um processo só
+MIN_TEXTOS_MULTIPROCESSO = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def carregar_modelo(nome: str = MODELO_PADRAO):
+    try:
+        import spacy
+    except ImportError:
+        return None
+
+    try:
+        # Parser e NER não são usados: só tokens, classe gramatical e lemas
+        return spacy.load(nome, disable=["parser", "ner"])
+    except OSError:
+        return None
+
+
+# None: ainda não verificado. O import do spaCy e o spacy.load (segundos) rodam
+# só na thread de processamento; o script do Streamlit lê apenas esta flag
+_modelo_disponivel = None
+_modelo_lock = threading.Lock()
+
+
+def _modelo_em_segundo_plano():
+    global _modelo_disponivel
+
+    with _modelo_lock:
+        nlp = carregar_modelo()
+        _modelo_disponivel = nlp is not None
+    return nlp
+
+
+def nlp_disponivel() -> bool:
+    return bool(_modelo_disponivel)
+
+
+# Já verificado e ausente (a etapa não roda neste processo)
+def nlp_desativado() -> bool:
+    return _modelo_disponivel is False
+
+
+def _hash_texto(texto: str) -> str:
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:16]
+
+
+# Identificador estável da resposta (senão, o rótulo da linha)
+def ids_das_respostas(df: pd.DataFrame) -> pd.Series:
+    for coluna in COLUNAS_ID:
+        if coluna in df.columns:
+            return df[coluna].astype(str)
+    return pd.Series(df.index.astype(str), index=df.index)
+
+
+# 🔎 Lemas (sem stopwords nem palavras indesejadas) e n-gramas da resposta;
+# n-gramas não atravessam pontuação nem começam/terminam em stopword
+def analisar_doc(doc, descartadas: frozenset) -> dict:
+    lemas = [
+        (t.lemma_ or t.text).lower()
+        for t in doc
+        if t.is_alpha and not t.is_stop and dobrar(t.lemma_ or t.text) not in descartadas
+    ]
+
+    trechos, atual = [], []
+    for t in doc:
+        if t.is_alpha:
+            atual.append(t)
+        elif atual:
+            trechos.append(atual)
+            atual = []
+    if atual:
+        trechos.append(atual)
+
+    frases = []
+    for trecho in trechos:
+        for n in TAMANHOS_NGRAMA:
+            for i in range(len(trecho) - n + 1):
+                janela = trecho[i:i + n]
+                if janela[0].is_stop or janela[-1].is_stop:
+                    continue
+                frases.append(" ".join(t.lower_ for t in janela))
+
+    return {"lemas": lemas, "frases": frases}
+
+
+# 💾 Resultados por coluna → id da resposta → {hash do texto, lemas, frases}
+class CacheNLP:
+    def __init__(self, path: str):
+        self.path = path
+        self.entradas: dict = {}
+        self.revisao = 0
+        self.lock = threading.Lock()
+        self._gravacao = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "CacheNLP":
+        cache = cls(path)
+
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    cache.entradas = json.load(f)
+            except (OSError, ValueError):
+                # Cache corrompido: reprocessa tudo
+                cache.entradas = {}
+
+        return cache
+
+    # 💾 Gravações em série (a última a terminar tem o conteúdo mais novo) e
+    # temporário exclusivo, para threads/processos não sobrescreverem o do outro
+    def save(self) -> None:
+        with self._gravacao:
+            with self.lock:
+                conteudo = json.dumps(self.entradas, ensure_ascii=False)
+
+            with escrita_atomica(self.path) as f:
+                f.write(conteudo)
+
+    def pendentes(self, coluna: str, ids: pd.Series, textos: pd.Series) -> list:
+        with self.lock:
+            feitos = self.entradas.get(coluna, {})
+            pendentes = []
+            for id_resposta, texto in zip(ids, textos):
+                h = _hash_texto(texto)
+                entrada = feitos.get(id_resposta)
+                if entrada is None or entrada["hash"] != h:
+                    pendentes.append((id_resposta, texto, h))
+            return pendentes
+
+    def guardar(self, coluna: str, resultados: dict) -> None:
+        with self.lock:
+            self.entradas.setdefault(coluna, {}).update(resultados)
+            self.revisao += 1
+
+    def resultados(self, coluna: str, ids: pd.Series) -> list:
+        with self.lock:
+            feitos = self.entradas.get(coluna, {})
+            return [feitos.get(i) for i in ids]
+
+
+def cache_path(cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"nlp_{MODELO_PADRAO}.json")
+
+
+_caches: dict = {}
+_caches_lock = threading.Lock()
+
+# Diretório usado pelo último processamento agendado (lido pelos gráficos)
+_diretorio = DEFAULT_CACHE_DIR
+
+
+def _cache_nlp(cache_dir: str = None) -> CacheNLP:
+    path = cache_path(cache_dir or _diretorio)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = CacheNLP.load(path)
+            _caches[path] = cache
+        return cache
+
+
+def _textos(df: pd.DataFrame, coluna: str):
+    textos = df[coluna].dropna().astype(str).str.strip()
+    textos = textos[textos != ""]
+    return ids_das_respostas(df).loc[textos.index], textos
+
+
+# ⚙️ Processa só as respostas novas ou alteradas, em lotes (nlp.pipe)
+def processar_respostas(df: pd.DataFrame, cache_dir: str = DEFAULT_CACHE_DIR, n_process: int = 1) -> int:
+    nlp = _modelo_em_segundo_plano()
+    if nlp is None or df.empty:
+        return 0
+
+    cache = _cache_nlp(cache_dir)
+    processadas = 0
+
+    for coluna in COLUNAS_NLP:
+        if coluna not in df.columns:
+            continue
+
+        ids, textos = _textos(df, coluna)
+        pendentes = cache.pendentes(coluna, ids, textos)
+        if not pendentes:
+            continue
+
+        descartadas = palavras_descartadas(tipo_da_coluna(coluna))
+        processos = n_process if len(pendentes) >= MIN_TEXTOS_MULTIPROCESSO else 1
+        docs = nlp.pipe((texto for _, texto, _ in pendentes), batch_size=TAMANHO_LOTE, n_process=processos)
+
+        resultados = {}
+        for (id_resposta, _, h), doc in zip(pendentes, docs):
+            resultados[id_resposta] = {"hash": h, **analisar_doc(doc, descartadas)}
+
+        cache.guardar(coluna, resultados)
+        cache.save()
+        processadas += len(resultados)
+
+    return processadas
+
+
+_versoes_agendadas = set()
+_agendamento_lock = threading.Lock()
+
+
+# 🔄 Dispara o processamento em segundo plano uma vez por versão da base
+# (n_process=1: nada de fork a partir de uma thread do servidor do Streamlit)
+def agendar_processamento(df: pd.DataFrame, cache_dir: str = DEFAULT_CACHE_DIR) -> bool:
+    global _diretorio
+
+    # Modelo já verificado e ausente: nem cria a thread
+    if _modelo_disponivel is False:
+        return False
+
+    versao = versao_base(df)
+    with _agendamento_lock:
+        _diretorio = cache_dir
+        if versao is not None and versao in _versoes_agendadas:
+            return False
+        _versoes_agendadas.add(versao)
+
+    threading.Thread(
+        target=processar_respostas,
+        args=(df, cache_dir, 1),
+        name="nlp-respostas",
+        daemon=True,
+    ).start()
+    return True
+
+
+# Muda a cada lote guardado: entra na chave dos agregados que leem o cache
+def revisao_nlp() -> int:
+    return _cache_nlp().revisao
+
+
+# 📊 Expressões (2-3 palavras) citadas em pelo menos `min_respostas` respostas do recorte
+def expressoes_frequentes(df: pd.DataFrame, coluna: str, min_respostas: int = 3):
+    if not nlp_disponivel() or coluna not in df.columns:
+        return None
+
+    ids, _ = _textos(df, coluna)
+    contagem = Counter()
+    for entrada in _cache_nlp().resultados(coluna, ids):
+        if entrada is not None:
+            contagem.update(set(entrada["frases"]))
+
+    frequentes = pd.Series(contagem, dtype="int64")
+    frequentes = frequentes[frequentes >= min_respostas]
+    return frequentes.sort_values(ascending=False, kind="stable")
+
+
+# 📊 Respostas do recorte que citam cada lema (flexões juntas: "estudar",
+# "estudando" e "estudei" contam como um termo); não processadas ficam de fora
+def lemas_frequentes(df: pd.DataFrame, coluna: str):
+    if not nlp_disponivel() or coluna not in df.columns:
+        return None
+
+    ids, _ = _textos(df, coluna)
+    contagem = Counter()
+    for entrada in _cache_nlp().resultados(coluna, ids):
+        if entrada is not None:
+            contagem.update(set(entrada["lemas"]))
+
+    return pd.Series(contagem, dtype="int64").sort_values(ascending=False, kind="stable")
+
+
+# 🖥️ Comando offline: processa a base atual (snapshot ou fonte configurada)
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lemas e expressões das respostas abertas (spaCy).")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="Processos do nlp.pipe")
+    parser.add_argument("--cache-dir", default=config("CACHE_DIR", DEFAULT_CACHE_DIR))
+    args = parser.parse_args(argv)
+
+    if carregar_modelo() is None:
+        print(f"spaCy ou o modelo {MODELO_PADRAO} não estão instalados.", file=sys.stderr)
+        return 1
+
+    from .load_data import carregar_base
+
+    df = carregar_base()
+    processadas = processar_respostas(df, args.cache_dir, n_process=args.processos)
+    print(f"{processadas} respostas processadas ({len(df)} na base).", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import functools
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+from .colunas import COLUNA_EXPECTATIVAS, COLUNA_JUSTIFICATIVA, COLUNA_MOTIVOS, COLUNA_OBJETIVOS
+
+
+# 🔤 Palavras: letras (com acento), aceitando hífen interno ("pós-graduação");
+# números e pontuação ficam de fora
+PADRAO_PALAVRA = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+
+# Palavras indesejadas para motivos de escolha
+PALAVRAS_INDESEJADAS_MOTIVOS = {
+    "fecap", "curso", "faculdade", "ensino", "boa", "gostei", "ano", "atenção", "outra", "alta", "dentro",
+    "pesquisei", "achei", "Paulo", "falar", "principalmente", "forte", "motivo", "grande", "escolhido",
+    "possui", "interesse", "outras", "pois", "ter", "foco", "quanto", "quero", "Paulo", "pais", "acredito",
+    "fiz", "oferece", "devido", "bom", "anos", "consegui", "objetivo", "Paulo", "todo", "nota", "o", "a",
+    "que", "de", "e", "para", "com", "sobre", "também", "fazer", "meu", "trabalho", "minha", "um", "uma",
+    "localização", "escolhi", 'além', "bem", "muito", "vi", "ainda", "pai", "porque", "instituição", "ótima",
+    "boa", "pessoas"
+}
+
+# Palavras indesejadas para expectativas do curso
+PALAVRAS_INDESEJADAS_EXPECTATIVAS = {
+    "fecap", "curso", "faculdade", "grade", "curricular", "ensino", "professores", "boa", "instituição", "nota", "espero", "tornar", "boas", "conseguir",
+    "o", "a", "que", "de", "e", "para", "com", "sobre", "também", "fazer", "meu", "trabalho", "minha", "um",
+    "uma", "localização", "escolhi", "mercado", "profissional", "experiência", "desenvolver", "aprendizado",
+    "alto", "área", "espero", "expectativa", "bastante", "qualidade", "trabalhar", "aprender"
+}
+
+# Palavras indesejadas para objetivos de vida
+PALAVRAS_INDESEJADAS_OBJETIVOS = {
+    "objetivo", "profissional", "vida", "futuro", "carreira", "crescimento", "desenvolvimento",
+    "pessoal", "expectativa", "sucesso", "trabalho", "realização", "conquista", "qualidade",
+    "aprender", "experiência", "aproveitar", "mercado", "carreira", "ser", "muito", "novos",
+    "desafios", "vencer", "busco", "em", "minha", "meu", "espero", "alcançar",
+    "adquirir", "fazer", "aproveitar", "ter", "possa", "assim", "surtando", "Médio"
+}
+
+# Palavras indesejadas para a justificativa da nota de recomendação
+PALAVRAS_INDESEJADAS_JUSTIFICATIVA = {
+    "fecap", "nota", "curso", "faculdade", "instituição", "dei", "atribuí", "atribui", "porque", "pois",
+    "ainda", "até", "momento", "muito", "bem", "bom", "boa", "tudo", "ter", "acho", "acredito"
+}
+
+PALAVRAS_INDESEJADAS = {
+    "motivos": PALAVRAS_INDESEJADAS_MOTIVOS,
+    "expectativas": PALAVRAS_INDESEJADAS_EXPECTATIVAS,
+    "objetivos": PALAVRAS_INDESEJADAS_OBJETIVOS,
+    "justificativa": PALAVRAS_INDESEJADAS_JUSTIFICATIVA,
+}
+
+# Lista de palavras indesejadas usada por cada pergunta aberta
+TIPO_POR_COLUNA = {
+    COLUNA_MOTIVOS: "motivos",
+    COLUNA_EXPECTATIVAS: "expectativas",
+    COLUNA_OBJETIVOS: "objetivos",
+    COLUNA_JUSTIFICATIVA: "justificativa",
+}
+
+
+# 🔡 Forma de comparação: minúsculas e sem acento ("Localização" == "localizacao")
+def dobrar(palavra: str) -> str:
+    decomposta = unicodedata.normalize("NFKD", palavra.casefold())
+    return "".join(c for c in decomposta if not unicodedata.combining(c))
+
+
+# 📦 Stopwords do NLTK (português) versionadas no repositório: nada é baixado
+# no startup; o corpus do NLTK só é consultado se o arquivo não existir
+ARQUIVO_STOPWORDS = os.path.join(os.path.dirname(__file__), "assets", "stopwords_pt.txt")
+
+
+def _ler_stopwords() -> list:
+    if os.path.exists(ARQUIVO_STOPWORDS):
+        with open(ARQUIVO_STOPWORDS, encoding="utf-8") as f:
+            return [linha.strip() for linha in f if linha.strip()]
+
+    try:
+        from nltk.corpus import stopwords
+
+        return stopwords.words("portuguese")
+    except (ImportError, LookupError):
+        return []
+
+
+@functools.lru_cache(maxsize=1)
+def _stopwords_base() -> frozenset:
+    return frozenset(dobrar(p) for p in _ler_stopwords())
+
+
+# 🧊 Conjunto final (stopwords + indesejadas do tipo), montado uma vez por tipo
+@functools.lru_cache(maxsize=None)
+def palavras_descartadas(tipo: str = "motivos") -> frozenset:
+    indesejadas = PALAVRAS_INDESEJADAS.get(tipo, PALAVRAS_INDESEJADAS_OBJETIVOS)
+    return _stopwords_base() | frozenset(dobrar(p) for p in indesejadas)
+
+
+def tipo_da_coluna(coluna: str) -> str:
+    return TIPO_POR_COLUNA.get(coluna, "motivos")
+
+
+# ✂️ Uma linha por palavra mantida (índice = linha da resposta); tudo em
+# operações vetorizadas do pandas. Maiúsculas/minúsculas só contam para comparar:
+# "Mercado" e "mercado" são o mesmo termo, exibido na grafia mais usada
+def tokenizar(respostas: pd.Series, tipo: str = "motivos") -> pd.Series:
+    palavras = respostas.dropna().astype(str).str.findall(PADRAO_PALAVRA).explode().dropna()
+    if palavras.empty:
+        return palavras.astype(object)
+
+    # A dobra roda uma vez por palavra distinta, não por ocorrência
+    descartadas = palavras_descartadas(tipo)
+    unicas = palavras.unique()
+    manter = {p: dobrar(p) not in descartadas for p in unicas}
+    palavras = palavras[palavras.map(manter).astype(bool)]
+
+    # Grafia exibida: a mais frequente entre as variações de caixa (empate: a primeira)
+    contagem = palavras.value_counts(sort=False).sort_values(ascending=False, kind="stable")
+    grafias = pd.Series(contagem.index, index=contagem.index.str.lower())
+    grafias = grafias[~grafias.index.duplicated()]
+    return palavras.str.lower().map(grafias)
+
+
+def limpar_texto(texto, tipo="motivos"):
+    palavras = PADRAO_PALAVRA.findall(str(texto))
+    descartadas = palavras_descartadas(tipo)
+    return " ".join(p for p in palavras if dobrar(p) not in descartadas)
@@ -0,0 +1,146 @@
+import itertools
+import threading
+import time
+
+import pandas as pd
+
+from .tracing import span
+
+# 🔢 Versões únicas no processo: um agendador recriado (cache limpo, hot reload)
+# continua a sequência, e os caches por versão nunca confundem duas bases.
+# Começa no relógio (ms) para seguir crescente mesmo se este módulo for recarregado
+_versoes = itertools.count(time.time_ns() // 1_000_000)
+
+
+# 🔄 Stale-while-revalidate: sempre responde com o último DataFrame bom e
+# reconstrói em segundo plano quando ele passa do TTL
+class RefreshScheduler:
+    def __init__(self, loader, ttl: float, initial=None, source: str = "graph"):
+        # loader() -> (DataFrame, fetched_at em epoch); initial() idem ou (None, None)
+        # source: rótulo da fonte do loader exibido no status ("graph", "csv"...)
+        self.loader = loader
+        self.ttl = ttl
+        self.initial = initial
+        self.source = source
+
+        self._df = None
+        self._fetched_at = None
+        self._source = None
+        self._version = 0
+        self._last_error = None
+        self._last_error_at = None
+        self._refreshing = False
+
+        self._lock = threading.Lock()
+        self._first_load = threading.Lock()
+
+    def _publish(self, df: pd.DataFrame, fetched_at: float, source: str) -> None:
+        with self._lock:
+            self._version = next(_versoes)
+            df.attrs["versao"] = self._version  # acompanha cópias e recortes do DataFrame
+            self._df = df
+            self._fetched_at = fetched_at
+            self._source = source
+            self._last_error = None
+            self._last_error_at = None
+
+    def _fail(self, erro: Exception) -> None:
+        with self._lock:
+            self._last_error = f"{type(erro).__name__}: {erro}"
+            self._last_error_at = time.time()
+
+    def _run_loader(self) -> None:
+        try:
+            with span("data_load", source=self.source):
+                df, fetched_at = self.loader()
+            if df is None or df.empty:
+                raise ValueError("Nenhum dado retornado da fonte.")
+
+            # Fonte sem mudanças devolve o mesmo DataFrame: mantém a versão (e os caches)
+            if df is self._df:
+                with self._lock:
+                    self._fetched_at = time.time()
+                return
+
+            self._publish(df, fetched_at, self.source)
+        except Exception as e:
+            # Mantém o último DataFrame bom; o erro fica visível no status
+            self._fail(e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _load_first(self) -> None:
+        with self._first_load:
+            if self._df is not None:
+                return
+
+            # Falha recente: as sessões que esperavam no lock não repetem a
+            # tentativa bloqueante (mesmo intervalo de _is_stale); get() -> None
+            if self._recent_failure():
+                return
+
+            # ⚡ Snapshot local primeiro; só bloqueia no Graph se não houver nada
+            if self.initial is not None:
+                try:
+                    with span("data_load", source="snapshot"):
+                        df, fetched_at = self.initial()
+                    if df is not None:
+                        self._publish(df, fetched_at, "snapshot")
+                        return
+                except Exception as e:
+                    self._fail(e)
+
+            with self._lock:
+                self._refreshing = True
+            self._run_loader()
+
+    def refresh(self) -> bool:
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+
+        threading.Thread(target=self._run_loader, daemon=True).start()
+        return True
+
+    def age(self):
+        if self._fetched_at is None:
+            return None
+        return max(time.time() - self._fetched_at, 0.0)
+
+    def _recent_failure(self) -> bool:
+        return self._last_error_at is not None and time.time() - self._last_error_at < self.ttl
+
+    def _is_stale(self) -> bool:
+        idade = self.age()
+        if idade is None or idade < self.ttl:
+            return False
+
+        # Depois de uma falha, espera um TTL antes de insistir no Graph
+        if self._recent_failure():
+            return False
+
+        return True
+
+    # 📥 Último DataFrame bom (None apenas se nunca houve carga com sucesso)
+    def get(self):
+        if self._df is None:
+            self._load_first()
+
+        if self._is_stale():
+            self.refresh()
+
+        return self._df
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "version": self._version,
+                "source": self._source,
+                "fetched_at": self._fetched_at,
+                "age_seconds": self.age(),
+                "refreshing": self._refreshing,
+                "last_error": self._last_error,
+                "rows": 0 if self._df is None else len(self._df),
+            }
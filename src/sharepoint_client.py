@@ -1,29 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
 import requests
 import pandas as pd
 
+from .diagnostico import diagnostico
+from .http_session import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    get_session,
+)
+from .token_cache import token_cache
+from .tracing import count, span
+
+# 📄 Itens por página ($top) nas leituras da lista
+DEFAULT_PAGE_SIZE = 1000
+
+# 🌐 Endpoints (configuráveis para apontar para um Graph local de testes)
+DEFAULT_BASE_URL = "https://graph.microsoft.com/v1.0"
+DEFAULT_AUTHORITY = "https://login.microsoftonline.com"
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+
 
 class GraphClient:
-    def __init__(self, tenant_id: str, client_id: str, client_secret: str):
+    def __init__(
+        self,
+        tenant_id: str,
+        client_id: str,
+        client_secret: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        base_url: str = DEFAULT_BASE_URL,
+        authority: str = DEFAULT_AUTHORITY,
+    ):
         self.tenant_id = tenant_id
         self.client_id = client_id
         self.client_secret = client_secret
-        self.base_url = "https://graph.microsoft.com/v1.0"  # ✅ CORREÇÃO
-        self.token = self._get_token()
+        self.base_url = base_url.rstrip("/")
+        self.authority = authority.rstrip("/")
+        self.timeout = timeout
+        self.page_size = page_size
+        self.prefetch = prefetch
+
+        # 🔌 Sessão keep-alive compartilhada (pool + retry com backoff)
+        self.session = get_session(pool_size, max_retries, backoff_factor)
+
+    # 🔑 Token compartilhado por tenant/client (renovado perto da expiração)
+    @property
+    def _token_key(self) -> tuple:
+        return (self.authority, self.tenant_id, self.client_id, GRAPH_SCOPE)
+
+    @property
+    def token(self) -> str:
+        return self._get_token()
 
     def _get_token(self) -> str:
-        url = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
+        return token_cache.get(self._token_key, self._request_token)
+
+    def _request_token(self) -> dict:
+        url = f"{self.authority}/{self.tenant_id}/oauth2/v2.0/token"
 
         data = {
             "grant_type": "client_credentials",
             "client_id": self.client_id,
             "client_secret": self.client_secret,
-            "scope": "https://graph.microsoft.com/.default",
+            "scope": GRAPH_SCOPE,
         }
 
-        response = requests.post(url, data=data)
+        with span("graph_token"):
+            response = self.session.post(url, data=data, timeout=self.timeout)
         response.raise_for_status()
 
-        return response.json()["access_token"]
+        return response.json()
 
     def _headers(self):
         return {
@@ -31,26 +85,49 @@ class GraphClient:
             "Content-Type": "application/json",
         }
 
+    def _get(self, url: str, headers: dict = None) -> requests.Response:
+        extra = headers or {}
+        response = self.session.get(url, headers={**self._headers(), **extra}, timeout=self.timeout)
+
+        # 🔁 Token revogado/expirado antes do previsto: renova uma vez
+        if response.status_code == 401:
+            token_cache.invalidate(self._token_key)
+            response = self.session.get(url, headers={**self._headers(), **extra}, timeout=self.timeout)
+
+        # 🚦 Retentativas feitas pelo urllib3 (429/5xx) antes desta resposta
+        retries = getattr(response.raw, "retries", None)
+        for tentativa in getattr(retries, "history", ()):
+            count("graph_retries", status=str(tentativa.status or "erro"))
+
+        response.raise_for_status()
+        return response
+
+    def _get_json(self, url: str, headers: dict = None) -> dict:
+        return self._get(url, headers).json()
+
+    # ⏱️ Uma página de itens (com prefetch, medida na thread de fundo)
+    def _get_page(self, url: str, headers: dict = None) -> dict:
+        with span("graph_page"):
+            data = self._get_json(url, headers)
+        count("graph_items", len(data.get("value", [])))
+        return data
+
     def get_site_id(self, hostname: str, site_path: str) -> str:
         url = f"{self.base_url}/sites/{hostname}:{site_path}"
 
-        response = requests.get(url, headers=self._headers())
-        response.raise_for_status()
+        response = self._get(url)
 
         return response.json()["id"]
 
     def get_list_id_by_name(self, site_id: str, list_name: str) -> str:
         url = f"{self.base_url}/sites/{site_id}/lists"
 
-        response = requests.get(url, headers=self._headers())
-        response.raise_for_status()
+        response = self._get(url)
 
         lists = response.json().get("value", [])
 
-        # 🔍 DEBUG útil (pode comentar depois)
-        print("LISTAS DISPONÍVEIS:")
-        for lst in lists:
-            print("-", lst.get("name"))
+        if diagnostico.ativo("debug"):
+            diagnostico.registrar("graph_listas", listas=[lst.get("name") for lst in lists])
 
         for lst in lists:
             if lst["name"].strip().lower() == list_name.strip().lower():
@@ -58,45 +135,175 @@ class GraphClient:
 
         raise ValueError(f"Lista '{list_name}' não encontrada.")
 
-    def fetch_list_items(self, site_id: str, list_id: str) -> list:
-        url = f"{self.base_url}/sites/{site_id}/lists/{list_id}/items?expand=fields"
-
-        all_items = []
+    # 🧾 Mapa nome de exibição -> nome interno das colunas da lista
+    def get_list_columns(self, site_id: str, list_id: str) -> dict:
+        url = f"{self.base_url}/sites/{site_id}/lists/{list_id}/columns?$select=name,displayName"
 
+        columns = {}
         while url:
-            response = requests.get(url, headers=self._headers())
-            response.raise_for_status()
+            data = self._get(url).json()
+            for col in data.get("value", []):
+                columns[col.get("displayName") or col["name"]] = col["name"]
+            url = data.get("@odata.nextLink")
+
+        return columns
+
+    def _items_url(self, site_id: str, list_id: str, select: list = None, filtro: str = None, delta: bool = False) -> str:
+        url = f"{self.base_url}/sites/{site_id}/lists/{list_id}/items"
+        if delta:
+            url += "/delta"
+
+        # 🎯 Projeção: só os campos pedidos voltam dentro de "fields"
+        if select:
+            url += f"?expand=fields($select={quote(','.join(select), safe=',_')})"
+        else:
+            url += "?expand=fields"
+
+        if self.page_size:
+            url += f"&$top={self.page_size}"
+
+        if filtro:
+            url += f"&$filter={quote(filtro, safe='')}"
+
+        return url
 
-            data = response.json()
+    # 🔄 Percorre o @odata.nextLink; com prefetch a próxima página já fica
+    # em voo enquanto a atual é processada (a ordem das páginas é mantida)
+    def _iter_pages(self, url: str, headers: dict = None):
+        if not self.prefetch:
+            while url:
+                data = self._get_page(url, headers)
+                url = data.get("@odata.nextLink")
+                yield data
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._get_page, url, headers)
+
+            while future is not None:
+                data = future.result()
+
+                next_url = data.get("@odata.nextLink")
+                future = executor.submit(self._get_page, next_url, headers) if next_url else None
+
+                yield data
+
+    # 📦 Uma lista de "fields" por página, sem acumular o JSON das anteriores
+    def iter_list_item_pages(self, site_id: str, list_id: str, select: list = None, filtro: str = None):
+        url = self._items_url(site_id, list_id, select, filtro)
+
+        # ⚠️ Filtro em coluna não indexada precisa deste cabeçalho no SharePoint
+        headers = {"Prefer": "HonorNonIndexedQueriesWarningMayFailRandomly"} if filtro else None
+
+        for data in self._iter_pages(url, headers):
             items = data.get("value", [])
 
-            # ✅ DEBUG (apenas para teste)
-            if items:
-                print("EXEMPLO DE ITEM:")
-                print(items[0])
+            # 🩺 Só os nomes dos campos (os valores são respostas pessoais)
+            if items and diagnostico.ativo("debug"):
+                diagnostico.registrar("graph_pagina", itens=len(items), campos=sorted(items[0].get("fields", {})))
 
-            # ✅ Extrai apenas os fields
-            rows = [item.get("fields", {}) for item in items]
-            all_items.extend(rows)
+            # ✅ Extrai os fields (com o id do item)
+            yield [item_fields(item) for item in items]
 
-            # 🔄 Paginação
-            url = data.get("@odata.nextLink")
+    def fetch_list_items(self, site_id: str, list_id: str, select: list = None, filtro: str = None) -> list:
+        all_items = []
+
+        for rows in self.iter_list_item_pages(site_id, list_id, select, filtro):
+            all_items.extend(rows)
 
         return all_items
 
+    # 🧱 Gerador: cada página vira um bloco colunar (dtype object estável entre páginas)
+    def iter_list_frames(self, site_id: str, list_id: str, select: list = None, filtro: str = None):
+        for rows in self.iter_list_item_pages(site_id, list_id, select, filtro):
+            if rows:
+                yield rows_to_frame(rows)
 
-# 🔧 Normalização de colunas
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
+    # 🚀 Concatena os blocos uma única vez no final
+    def fetch_list_frame(self, site_id: str, list_id: str, select: list = None, filtro: str = None) -> pd.DataFrame:
+        return frames_to_dataframe(self.iter_list_frames(site_id, list_id, select, filtro))
+
+    # 🔁 Consulta delta: só o que mudou desde o último deltaLink
+    def fetch_list_items_delta(self, site_id: str, list_id: str, delta_link: str = None, select: list = None):
+        url = delta_link or self._items_url(site_id, list_id, select, delta=True)
+
+        changed = {}
+        removed = set()
+        delta_link = None
+
+        for data in self._iter_pages(url):
+            for item in data.get("value", []):
+                item_id = str(item.get("id"))
+
+                # 🗑️ Itens excluídos chegam com "@removed" ou faceta "deleted"
+                if "@removed" in item or "deleted" in item:
+                    removed.add(item_id)
+                    changed.pop(item_id, None)
+                    continue
+
+                changed[item_id] = item_fields(item)
+                removed.discard(item_id)
+
+            # 🔗 A última página traz o deltaLink da próxima sincronização
+            delta_link = data.get("@odata.deltaLink", delta_link)
+
+        return changed, removed, delta_link
+
+
+# 🆔 O Graph devolve o id só no item (fora de "fields" quando há $select):
+# é ele que identifica a resposta entre sincronizações
+def item_fields(item: dict) -> dict:
+    fields = item.get("fields", {})
+    return {"id": str(item["id"]), **fields} if "id" in item else fields
 
-    df.columns = (
-        df.columns
+
+def rows_to_frame(rows: list) -> pd.DataFrame:
+    return pd.DataFrame.from_records(rows).astype(object)
+
+
+# 🧱 Linhas já em memória (snapshot delta) em blocos do tamanho de uma página
+def iter_row_frames(rows: list, chunk_size: int = DEFAULT_PAGE_SIZE):
+    for inicio in range(0, len(rows), chunk_size):
+        yield rows_to_frame(rows[inicio:inicio + chunk_size])
+
+
+# 🧱 Junta os blocos por página; colunas ausentes numa página viram NA
+def frames_to_dataframe(frames) -> pd.DataFrame:
+    chunks = list(frames)
+    if not chunks:
+        return pd.DataFrame()
+
+    with span("dataframe_concat"):
+        df = pd.concat(chunks, ignore_index=True, sort=False)
+        return df.infer_objects()
+
+
+# 📅 Filtro OData por intervalo de datas (ex.: "Hora de início")
+def filtro_periodo(coluna: str, inicio: str = None, fim: str = None) -> str:
+    partes = []
+    if inicio:
+        partes.append(f"fields/{coluna} ge '{inicio}'")
+    if fim:
+        partes.append(f"fields/{coluna} lt '{fim}'")
+    return " and ".join(partes)
+
+
+# 🔧 Normalização de colunas
+def normalize_names(columns) -> pd.Index:
+    return (
+        pd.Index(columns)
         .str.strip()
         .str.replace("\n", " ", regex=False)
         .str.replace("\r", " ", regex=False)
     )
 
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+
+    df.columns = normalize_names(df.columns)
+
     return df
 
 
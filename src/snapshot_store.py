@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import pickle
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .arquivos import escrita_atomica, lock_do_arquivo
+from .delta_sync import DEFAULT_CACHE_DIR
+
+# 📦 Parquet quando o pyarrow estiver instalado; pickle como alternativa
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    PARQUET_DISPONIVEL = False
+
+
+def schema_hash(df: pd.DataFrame) -> str:
+    assinatura = "|".join(f"{col}:{dtype}" for col, dtype in df.dtypes.items())
+    return hashlib.sha1(assinatura.encode("utf-8")).hexdigest()
+
+
+def _caminhos(nome: str, cache_dir: str):
+    base = os.path.join(cache_dir, nome)
+    return f"{base}.parquet", f"{base}.pkl", f"{base}.meta.json"
+
+
+# 💾 Grava o DataFrame normalizado + sidecar de metadados (escrita atômica,
+# uma gravação por vez no processo; entre processos, a leitura descarta dados e
+# sidecar de gerações diferentes)
+# origem / schema: identificação da lista configurada e versão do schema esperado,
+# conferidas na leitura
+def salvar_snapshot(
+    df: pd.DataFrame,
+    nome: str,
+    list_id: str = None,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    origem: str = None,
+    schema: str = None,
+) -> dict:
+    parquet_path, pickle_path, meta_path = _caminhos(nome, cache_dir)
+
+    with lock_do_arquivo(meta_path):
+        formato = None
+        if PARQUET_DISPONIVEL:
+            try:
+                with escrita_atomica(parquet_path, "wb") as f:
+                    df.to_parquet(f, index=False)
+                formato = "parquet"
+            except Exception:
+                # Colunas com objetos aninhados (lookup, listas) não cabem no Parquet
+                pass
+
+        if formato is None:
+            with escrita_atomica(pickle_path, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            formato = "pickle"
+
+        meta = {
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "list_id": list_id,
+            "origem": origem,
+            "schema": schema,
+            "schema_hash": schema_hash(df),
+            "rows": len(df),
+            "formato": formato,
+        }
+
+        with escrita_atomica(meta_path) as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    return meta
+
+
+# 📂 Lê o snapshot salvo; (None, None) se não existir, estiver inconsistente ou
+# não corresponder à lista (list_id / origem) e ao schema esperados
+def carregar_snapshot(
+    nome: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    list_id: str = None,
+    origem: str = None,
+    schema: str = None,
+):
+    parquet_path, pickle_path, meta_path = _caminhos(nome, cache_dir)
+
+    if not os.path.exists(meta_path):
+        return None, None
+
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        # 🎯 Snapshot de outra lista ou de antes de uma mudança de schema: descarta
+        esperado = {"list_id": list_id, "origem": origem, "schema": schema}
+        if any(valor is not None and meta.get(chave) != valor for chave, valor in esperado.items()):
+            return None, None
+
+        if meta.get("formato") == "parquet":
+            df = pd.read_parquet(parquet_path)
+        else:
+            with open(pickle_path, "rb") as f:
+                df = pickle.load(f)
+    except Exception:
+        return None, None
+
+    # Arquivo de dados e sidecar de gerações diferentes: descarta
+    if len(df) != meta.get("rows"):
+        return None, None
+
+    return df, meta
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from .tracing import count
+
+
+# ⏱️ Renova o token alguns minutos antes de expirar
+REFRESH_MARGIN = 5 * 60
+DEFAULT_EXPIRES_IN = 60 * 60
+
+
+class TokenCache:
+    def __init__(self, refresh_margin: int = REFRESH_MARGIN, background_refresh: bool = False):
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self._entries: dict = {}
+        self._key_locks: dict = {}
+        self._lock = threading.Lock()
+        self._timers: dict = {}
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._key_locks[key] = lock
+            return lock
+
+    def _is_fresh(self, entry) -> bool:
+        return entry is not None and time.time() < entry[1] - self.refresh_margin
+
+    # 🔑 Retorna o token em cache ou chama `fetcher` (apenas uma thread por chave)
+    def get(self, key, fetcher) -> str:
+        entry = self._entries.get(key)
+        if self._is_fresh(entry):
+            count("cache_requests", cache="token", result="hit")
+            return entry[0]
+
+        with self._key_lock(key):
+            # Outra thread pode ter renovado enquanto esperávamos o lock
+            entry = self._entries.get(key)
+            if self._is_fresh(entry):
+                count("cache_requests", cache="token", result="hit")
+                return entry[0]
+
+            count("cache_requests", cache="token", result="miss")
+            return self._refresh(key, fetcher)
+
+    def _refresh(self, key, fetcher) -> str:
+        payload = fetcher()
+        token = payload["access_token"]
+        expires_in = int(payload.get("expires_in", DEFAULT_EXPIRES_IN))
+        self._entries[key] = (token, time.time() + expires_in)
+
+        if self.background_refresh:
+            self._schedule(key, fetcher, expires_in)
+
+        return token
+
+    # 🔄 Renovação antecipada em segundo plano (não bloqueia as sessões)
+    def _schedule(self, key, fetcher, expires_in: int) -> None:
+        delay = max(expires_in - self.refresh_margin - 30, 30)
+
+        def _run():
+            try:
+                with self._key_lock(key):
+                    self._refresh(key, fetcher)
+            except Exception:
+                # Falhou em segundo plano: a próxima chamada a `get` tenta de novo
+                pass
+
+        timer = threading.Timer(delay, _run)
+        timer.daemon = True
+
+        with self._lock:
+            previous = self._timers.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+            self._timers[key] = timer
+
+        timer.start()
+
+    def invalidate(self, key) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+        self._entries.clear()
+
+
+# 🌐 Cache único por processo, compartilhado entre as sessões do Streamlit
+token_cache = TokenCache()
@@ -0,0 +1,194 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from .arquivos import escrita_atomica
+
+
+# ⏱️ Spans de tempo + contadores do processo, sem dependências externas.
+# Exportação:
+# - logs estruturados: um JSON por span no logger "src.tracing" (nível INFO;
+#   silencioso enquanto o logging não for configurado para isso)
+# - texto no formato do Prometheus (prometheus_text / write_textfile, para o
+#   textfile collector do node_exporter)
+logger = logging.getLogger(__name__)
+
+PREFIX = "dashboard"
+
+# Limites (s) dos buckets do histograma de duração
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NOME_INVALIDO = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted(labels.items()))
+
+
+def _metric_name(*partes) -> str:
+    return _NOME_INVALIDO.sub("_", "_".join(str(p) for p in partes))
+
+
+def _labels_text(labels) -> str:
+    if not labels:
+        return ""
+    pares = []
+    for chave, valor in labels:
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pares.append(f'{_metric_name(chave)}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+# 🔢 Coletores devolvem dicts (aninhados) de números: viram gauges achatados
+def _flatten(prefixo: str, valores: dict, saida: dict) -> None:
+    for chave, valor in valores.items():
+        nome = f"{prefixo}_{chave}"
+        if isinstance(valor, dict):
+            _flatten(nome, valor, saida)
+        elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            saida[_metric_name(nome)] = valor
+
+
+class Tracer:
+    def __init__(self, buckets: tuple = BUCKETS, recent: int = 500):
+        self.buckets = buckets
+        self._spans: dict = {}  # chave -> [contagem, soma, máximo, buckets]
+        self._counters: dict = {}
+        self._collectors: dict = {}
+        self._recent = deque(maxlen=recent)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        registro = {"span": name, **labels, "ms": round(seconds * 1000, 3), "ts": round(time.time(), 3)}
+
+        with self._lock:
+            serie = self._spans.get(_key(name, labels))
+            if serie is None:
+                serie = self._spans[_key(name, labels)] = [0, 0.0, 0.0, [0] * len(self.buckets)]
+            serie[0] += 1
+            serie[1] += seconds
+            serie[2] = max(serie[2], seconds)
+            for i, limite in enumerate(self.buckets):
+                if seconds <= limite:
+                    serie[3][i] += 1
+            self._recent.append(registro)
+
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.append(registro)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+    # ⏱️ Context manager (ou decorator) que mede o bloco; falhas contam em errors_total
+    # (Exception: o rerun/st.stop do Streamlit interrompe o script sem ser erro)
+    @contextmanager
+    def span(self, name: str, **labels):
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count("errors", span=name)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - inicio, **labels)
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            chave = _key(name, labels)
+            self._counters[chave] = self._counters.get(chave, 0) + value
+
+    def register_collector(self, name: str, func) -> None:
+        self._collectors[name] = func
+
+    # 🧵 Spans da thread atual (no Streamlit, um rerun de uma sessão)
+    def begin_trace(self) -> list:
+        self._local.trace = []
+        return self._local.trace
+
+    def end_trace(self) -> list:
+        trace = getattr(self._local, "trace", None) or []
+        self._local.trace = None
+        return trace
+
+    def recent(self) -> list:
+        with self._lock:
+            return list(self._recent)
+
+    def gauges(self) -> dict:
+        saida = {}
+        for nome, func in list(self._collectors.items()):
+            try:
+                _flatten(nome, func(), saida)
+            except Exception:
+                logger.exception("Coletor de métricas '%s' falhou", nome)
+        return saida
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            spans = [
+                {
+                    "span": nome,
+                    **dict(labels),
+                    "count": serie[0],
+                    "total_ms": serie[1] * 1000,
+                    "mean_ms": serie[1] * 1000 / serie[0],
+                    "max_ms": serie[2] * 1000,
+                }
+                for (nome, labels), serie in self._spans.items()
+            ]
+            counters = [
+                {"counter": nome, **dict(labels), "value": valor}
+                for (nome, labels), valor in self._counters.items()
+            ]
+
+        return {"spans": spans, "counters": counters, "gauges": self.gauges()}
+
+    # 📈 Formato texto do Prometheus (histograma por span, contadores, gauges)
+    def prometheus_text(self) -> str:
+        with self._lock:
+            spans = {chave: (s[0], s[1], list(s[3])) for chave, s in self._spans.items()}
+            counters = dict(self._counters)
+
+        linhas = []
+        histograma = f"{PREFIX}_span_seconds"
+        linhas.append(f"# HELP {histograma} Duração dos spans instrumentados.")
+        linhas.append(f"# TYPE {histograma} histogram")
+        for (nome, labels), (contagem, soma, buckets) in sorted(spans.items()):
+            base = (("span", nome),) + labels
+            for limite, acumulado in zip(self.buckets, buckets):
+                linhas.append(f"{histograma}_bucket{_labels_text(base + (('le', limite),))} {acumulado}")
+            linhas.append(f"{histograma}_bucket{_labels_text(base + (('le', '+Inf'),))} {contagem}")
+            linhas.append(f"{histograma}_sum{_labels_text(base)} {soma}")
+            linhas.append(f"{histograma}_count{_labels_text(base)} {contagem}")
+
+        nomes = sorted({nome for nome, _ in counters})
+        for nome in nomes:
+            metrica = _metric_name(PREFIX, nome, "total")
+            linhas.append(f"# TYPE {metrica} counter")
+            for (outro, labels), valor in sorted(counters.items()):
+                if outro == nome:
+                    linhas.append(f"{metrica}{_labels_text(labels)} {valor}")
+
+        for nome, valor in sorted(self.gauges().items()):
+            metrica = _metric_name(PREFIX, nome)
+            linhas.append(f"# TYPE {metrica} gauge")
+            linhas.append(f"{metrica} {valor}")
+
+        return "\n".join(linhas) + "\n"
+
+    # 💾 Escrita atômica (o coletor nunca lê um arquivo pela metade)
+    def write_textfile(self, path: str) -> None:
+        conteudo = self.prometheus_text()
+        with escrita_atomica(path) as f:
+            f.write(conteudo)
+
+
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from ..tracing import span
+
+
+OPCAO_TODOS = "Todos"
+
+
+# 🗂️ Índice dos filtros da sidebar: construído uma vez por versão da base
+class IndiceFiltros:
+    def __init__(self, df: pd.DataFrame, colunas: list, decrescentes: tuple = ()):
+        self.total = len(df)
+        self.opcoes = {}
+        self.posicoes = {}
+
+        for coluna in colunas:
+            if coluna not in df.columns:
+                continue
+
+            serie = df[coluna]
+            codigos, valores = pd.factorize(serie, sort=False, use_na_sentinel=True)
+
+            # Posições de cada valor (ordem crescente), agrupadas por código
+            ordem = np.argsort(codigos, kind="stable")
+            contagens = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+            inicio = int((codigos < 0).sum())  # NA (-1) fica no começo da ordenação
+
+            grupos = {}
+            for i, valor in enumerate(valores):
+                fim = inicio + int(contagens[i])
+                grupos[valor] = ordem[inicio:fim]
+                inicio = fim
+
+            self.posicoes[coluna] = grupos
+
+            # Mesma ordem das listas anteriores: ordem de aparição, ou decrescente
+            opcoes = list(valores)
+            if coluna in decrescentes:
+                opcoes = sorted(opcoes, reverse=True)
+            self.opcoes[coluna] = opcoes
+
+    def opcoes_de(self, coluna: str) -> list:
+        return [OPCAO_TODOS] + self.opcoes.get(coluna, [])
+
+    # 🎯 Intersecta as posições dos valores escolhidos (None = base inteira)
+    def resolver(self, selecao: dict):
+        conjuntos = []
+
+        for coluna, valor in selecao.items():
+            if valor == OPCAO_TODOS or coluna not in self.posicoes:
+                continue
+            conjuntos.append(self.posicoes[coluna].get(valor, np.empty(0, dtype=np.intp)))
+
+        if not conjuntos:
+            return None
+
+        conjuntos.sort(key=len)
+        posicoes = conjuntos[0]
+        for outro in conjuntos[1:]:
+            posicoes = np.intersect1d(posicoes, outro, assume_unique=True)
+
+        return posicoes
+
+
+# 🏷️ O recorte leva em attrs["filtros"] a seleção efetiva (chave dos caches de gráficos)
+def aplicar_filtros(df: pd.DataFrame, indice: IndiceFiltros, selecao: dict) -> pd.DataFrame:
+    with span("filters_apply"):
+        posicoes = indice.resolver(selecao)
+        recorte = df.copy(deep=False) if posicoes is None else df.take(posicoes)
+    recorte.attrs["filtros"] = tuple(
+        (coluna, valor) for coluna, valor in selecao.items()
+        if valor != OPCAO_TODOS and coluna in indice.posicoes
+    )
+    return recorte
@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# 🗃️ Bases completas por versão: estruturas derivadas (tabelas longas, índices)
+# são montadas sobre a base inteira e depois recortadas pelo filtro da sessão
+MAX_VERSOES = 2
+
+_bases: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+_ao_descartar = []
+
+
+def versao_base(df: pd.DataFrame):
+    return df.attrs.get("versao")
+
+
+def registrar_base(df: pd.DataFrame) -> None:
+    versao = versao_base(df)
+    if versao is None:
+        return
+
+    descartadas = []
+    with _lock:
+        if versao in _bases:
+            return
+        _bases[versao] = df
+        while len(_bases) > MAX_VERSOES:
+            descartadas.append(_bases.popitem(last=False)[0])
+
+    # Caches derivados liberam o que era da versão descartada
+    for versao_antiga in descartadas:
+        for callback in _ao_descartar:
+            callback(versao_antiga)
+
+
+def base_completa(df: pd.DataFrame):
+    versao = versao_base(df)
+    if versao is None:
+        return None
+    with _lock:
+        return _bases.get(versao)
+
+
+def ao_descartar_versao(callback) -> None:
+    _ao_descartar.append(callback)
+
+
+# ✂️ Recorta uma tabela derivada (coluna "linha" = rótulo da linha na base) para o filtro atual
+def recortar_por_linhas(tabela: pd.DataFrame, df: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
+    if base is not None and len(df) == len(base):
+        return tabela
+    return tabela[tabela["linha"].isin(df.index)]
@@ -0,0 +1,9 @@
+import pytest
+
+from src.load_data import carregar_csv
+
+
+# 📁 CSV de exemplo no schema normalizado (o mesmo que o app usa com FONTE_DADOS=csv)
+@pytest.fixture(scope="session")
+def base():
+    return carregar_csv()
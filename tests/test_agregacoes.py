@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from src.agregacoes import contar_likert
+from src.colunas import (
+    COLUNAS_IES,
+    COLUNAS_INFLUENCIA,
+    COLUNAS_SATISFACAO,
+    ESCALA_INFLUENCIA,
+    ESCALA_QUALIDADE,
+    ESCALA_SATISFACAO,
+)
+
+MATRIZES = [
+    (COLUNAS_SATISFACAO, ESCALA_SATISFACAO),
+    (COLUNAS_IES, ESCALA_QUALIDADE),
+    (COLUNAS_INFLUENCIA, ESCALA_INFLUENCIA),
+]
+
+
+# Montagem anterior: um value_counts + reindex por coluna
+def _contar_como_antes(df: pd.DataFrame, colunas: list, escala: list) -> pd.DataFrame:
+    dados = pd.DataFrame()
+    for coluna in colunas:
+        if coluna in df.columns:
+            dados[coluna] = df[coluna].value_counts().reindex(escala, fill_value=0)
+    return dados.T
+
+
+def _comparar(atual: pd.DataFrame, esperado: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(
+        atual, esperado, check_names=False, check_column_type=False, check_index_type=False, check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("colunas, escala", MATRIZES)
+@pytest.mark.parametrize("categorico", [True, False], ids=["schema", "texto"])
+def test_matriz_igual_a_contagem_anterior(base, colunas, escala, categorico):
+    df = base if categorico else base.astype({c: "str" for c in colunas if c in base.columns})
+
+    _comparar(contar_likert(df, colunas, escala), _contar_como_antes(df, colunas, escala))
+
+
+@pytest.mark.parametrize("colunas, escala", MATRIZES)
+def test_matriz_por_grupo(base, colunas, escala):
+    por = "Qual o seu Curso?"
+    matriz = contar_likert(base, colunas, escala, por=por)
+
+    for grupo, recorte in base.groupby(por, observed=True):
+        _comparar(matriz.loc[grupo], _contar_como_antes(recorte, colunas, escala))
+
+    assert set(matriz.index.get_level_values(por)) == set(base[por].dropna())
+
+
+def test_valores_fora_da_escala_e_colunas_ausentes():
+    escala = ["Ruim", "Bom"]
+    df = pd.DataFrame({"A": ["Bom", "Ótimo", None, "Ruim", "Bom"], "B": ["Ruim", "Ruim", "Ruim", None, None]})
+
+    matriz = contar_likert(df, ["A", "C", "B"], escala)
+
+    assert matriz.index.tolist() == ["A", "B"]
+    assert matriz.loc["A"].tolist() == [1, 2]
+    assert matriz.loc["B"].tolist() == [3, 0]
+    assert contar_likert(df, ["C"], escala).empty
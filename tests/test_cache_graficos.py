@@ -0,0 +1,107 @@
+import threading
+
+import pandas as pd
+
+from src.cache_graficos import CacheLRU, agregado_em_cache, cache_agregados
+
+
+def test_lru_descarta_o_menos_usado():
+    cache = CacheLRU(max_itens=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.get("a") == (True, 1)  # "a" passa a ser o mais recente
+    cache.put("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["itens"], estatisticas["hits"], estatisticas["misses"], estatisticas["evictions"]) == (2, 3, 1, 1)
+
+
+def test_valor_none_e_regravacao():
+    cache = CacheLRU(max_itens=2)
+    cache.put("a", None)
+    cache.put("a", None)
+
+    assert cache.get("a") == (True, None)
+    assert cache.estatisticas()["itens"] == 1
+
+
+def test_orcamento_de_bytes():
+    cache = CacheLRU(max_itens=10, max_bytes=10)
+    cache.put("a", b"x" * 4)
+    cache.put("b", b"x" * 4)
+    cache.put("c", b"x" * 4)  # passa de 10 bytes: sai "a"
+
+    assert cache.get("a") == (False, None)
+    assert cache.estatisticas()["bytes"] == 8
+
+    cache.put("grande", b"x" * 11)  # maior que o orçamento: nem entra
+    assert cache.get("grande") == (False, None)
+    assert cache.estatisticas()["bytes"] == 8
+
+    cache.put("b", b"x")  # substituir ajusta o total
+    assert cache.estatisticas()["bytes"] == 5
+
+
+def test_descartar_por_condicao():
+    cache = CacheLRU(max_itens=10, max_bytes=100)
+    for versao in (1, 2):
+        for grafico in ("renda", "cargo"):
+            cache.put((versao, grafico), b"png")
+
+    cache.descartar(lambda chave: chave[0] == 1)
+
+    assert cache.estatisticas()["itens"] == 2
+    assert cache.estatisticas()["bytes"] == 6
+    assert cache.get((2, "renda")) == (True, b"png")
+
+
+def test_acesso_concorrente():
+    cache = CacheLRU(max_itens=50, max_bytes=500)
+
+    def trabalhar(n):
+        for i in range(2000):
+            chave = (n * 7 + i) % 80
+            if not cache.get(chave)[0]:
+                cache.put(chave, b"x" * (chave % 9 + 1))
+
+    threads = [threading.Thread(target=trabalhar, args=(n,)) for n in range(8)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    estatisticas = cache.estatisticas()
+    assert estatisticas["itens"] <= 50
+    assert estatisticas["bytes"] <= 500
+    assert estatisticas["hits"] + estatisticas["misses"] == 8 * 2000
+
+
+def test_agregado_em_cache_por_versao_e_filtros():
+    chamadas = []
+
+    @agregado_em_cache
+    def contar(df, coluna):
+        chamadas.append(coluna)
+        return df[coluna].value_counts()
+
+    df = pd.DataFrame({"curso": ["A", "B", "A"]})
+    df.attrs.update(versao="teste-14", filtros=())
+
+    primeiro = contar(df, "curso")
+    assert contar(df, "curso") is primeiro
+    assert chamadas == ["curso"]
+
+    recorte = df.iloc[:1]
+    recorte.attrs.update(versao="teste-14", filtros=(("curso", "A"),))
+    assert contar(recorte, "curso").tolist() == [1]
+    assert chamadas == ["curso", "curso"]
+
+    # Sem versão/filtros (DataFrame avulso): calcula sempre, nada vai para o cache
+    avulso = pd.DataFrame({"curso": ["A"]})
+    contar(avulso, "curso")
+    contar(avulso, "curso")
+    assert len(chamadas) == 4
+
+    cache_agregados.descartar(lambda chave: chave[0][0] == "teste-14")
@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.filters import OPCAO_TODOS, IndiceFiltros, aplicar_filtros
+
+CURSO = "Qual o seu Curso?"
+PERIODO = "Qual é o seu período?"
+SEMESTRE = "Semestre"
+COLUNAS = [CURSO, PERIODO, SEMESTRE]
+
+
+# Cadeia de máscaras usada pelo app.py antes do índice
+def _filtrar_como_antes(df: pd.DataFrame, curso, periodo, semestre) -> pd.DataFrame:
+    df_filtrado = df.copy()
+
+    if curso != "Todos" and CURSO in df.columns:
+        df_filtrado = df_filtrado[df_filtrado[CURSO] == curso]
+
+    if periodo != "Todos" and PERIODO in df.columns:
+        df_filtrado = df_filtrado[df_filtrado[PERIODO] == periodo]
+
+    if semestre != "Todos":
+        df_filtrado = df_filtrado[df_filtrado[SEMESTRE] == semestre]
+
+    return df_filtrado
+
+
+def _opcoes_como_antes(df: pd.DataFrame) -> dict:
+    return {
+        CURSO: ["Todos"] + list(df[CURSO].dropna().unique()),
+        PERIODO: ["Todos"] + list(df[PERIODO].dropna().unique()),
+        SEMESTRE: ["Todos"] + sorted(df[SEMESTRE].dropna().unique(), reverse=True),
+    }
+
+
+@pytest.fixture(scope="module")
+def com_vazios(base):
+    # Rótulos fora de ordem e respostas sem curso/turno/semestre
+    df = base.copy()
+    df.index = np.random.default_rng(0).permutation(len(df)) * 3
+    df.loc[df.index[::7], CURSO] = pd.NA
+    df.loc[df.index[::11], PERIODO] = pd.NA
+    df.loc[df.index[::13], SEMESTRE] = pd.NA
+    return df
+
+
+@pytest.mark.parametrize("nome", ["base", "com_vazios"])
+def test_opcoes_iguais_as_listas_anteriores(nome, request):
+    df = request.getfixturevalue(nome)
+    indice = IndiceFiltros(df, COLUNAS, decrescentes=(SEMESTRE,))
+
+    for coluna, opcoes in _opcoes_como_antes(df).items():
+        assert indice.opcoes_de(coluna) == opcoes
+
+
+@pytest.mark.parametrize("nome", ["base", "com_vazios"])
+def test_recortes_iguais_a_cadeia_anterior(nome, request):
+    df = request.getfixturevalue(nome)
+    indice = IndiceFiltros(df, COLUNAS, decrescentes=(SEMESTRE,))
+
+    combinacoes = itertools.product(*(indice.opcoes_de(c) for c in COLUNAS))
+    for i, (curso, periodo, semestre) in enumerate(combinacoes):
+        recorte = aplicar_filtros(df, indice, {CURSO: curso, PERIODO: periodo, SEMESTRE: semestre})
+        esperado = _filtrar_como_antes(df, curso, periodo, semestre)
+
+        # Mesmas linhas na mesma ordem; o conteúdo completo numa amostra das combinações
+        assert recorte.index.equals(esperado.index)
+        if i % 20 == 0:
+            pd.testing.assert_frame_equal(recorte, esperado)
+
+
+def test_valor_inexistente_e_coluna_ausente(base):
+    indice = IndiceFiltros(base, COLUNAS + ["Coluna que não existe"])
+
+    assert aplicar_filtros(base, indice, {CURSO: "Curso que não existe"}).empty
+
+    recorte = aplicar_filtros(base, indice, {"Coluna que não existe": "x", PERIODO: OPCAO_TODOS})
+    assert len(recorte) == len(base)
+    assert recorte.attrs["filtros"] == ()
+
+
+def test_filtros_efetivos_em_attrs(base):
+    indice = IndiceFiltros(base, COLUNAS)
+    curso = indice.opcoes_de(CURSO)[1]
+
+    recorte = aplicar_filtros(base, indice, {CURSO: curso, PERIODO: OPCAO_TODOS, SEMESTRE: OPCAO_TODOS})
+
+    assert recorte.attrs["filtros"] == ((CURSO, curso),)
@@ -0,0 +1,197 @@
+import pandas as pd
+import pytest
+import requests
+
+from benchmarks.graph_local import LIST_ID, SITE_ID, GraphLocal
+from src.delta_sync import sincronizar_itens
+from src.sharepoint_client import GraphClient
+
+TOTAL = 25
+
+
+@pytest.fixture
+def dados() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Resposta": [f"resposta {i}" for i in range(1, TOTAL + 1)],
+            "Nota": [i % 11 for i in range(1, TOTAL + 1)],
+        }
+    )
+
+
+def _cliente(graph: GraphLocal, **opcoes) -> GraphClient:
+    return GraphClient(
+        tenant_id="local",
+        client_id="teste",
+        client_secret="teste",
+        backoff_factor=0,
+        base_url=graph.base_url,
+        authority=graph.authority,
+        **opcoes,
+    )
+
+
+def _ids(linhas) -> list:
+    return [int(linha["id"]) for linha in linhas]
+
+
+# 📄 Paginação: mesma ordem do servidor com e sem prefetch
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_paginas_em_ordem(dados, prefetch):
+    with GraphLocal(dados, pagina_maxima=4, latencia=0.002) as graph:
+        df = _cliente(graph, page_size=4, prefetch=prefetch).fetch_list_frame(SITE_ID, LIST_ID)
+
+        assert graph.contadores()["paginas"] == 7
+
+    assert df["id"].astype(int).tolist() == list(range(1, TOTAL + 1))
+    assert df["field_1"].iloc[-1] == f"resposta {TOTAL}"
+
+
+# 🚦 429 (com Retry-After) e 503 são repetidos sem perder nem duplicar itens
+@pytest.mark.parametrize("prefetch", [False, True])
+@pytest.mark.parametrize("falha", [{"throttle_a_cada": 3, "retry_after": 0}, {"erro_a_cada": 3}])
+def test_retentativas(dados, falha, prefetch):
+    with GraphLocal(dados, pagina_maxima=4, **falha) as graph:
+        linhas = _cliente(graph, page_size=4, prefetch=prefetch).fetch_list_items(SITE_ID, LIST_ID)
+        contadores = graph.contadores()
+
+    assert _ids(linhas) == list(range(1, TOTAL + 1))
+    assert contadores["throttled"] + contadores["erros"] > 0
+
+
+def test_retentativas_esgotadas(dados):
+    with GraphLocal(dados, erro_a_cada=1) as graph:
+        with pytest.raises(requests.HTTPError) as erro:
+            _cliente(graph, max_retries=2).fetch_list_items(SITE_ID, LIST_ID)
+
+        assert graph.contadores()["requisicoes"] == 3
+
+    assert erro.value.response.status_code == 503
+
+
+# 🔑 Token revogado no servidor (401): o cliente pede outro e repete a chamada
+def test_token_renovado_apos_401(dados):
+    with GraphLocal(dados) as graph:
+        client = _cliente(graph)
+        assert len(client.fetch_list_items(SITE_ID, LIST_ID)) == TOTAL
+
+        graph.revogar_tokens()
+        assert len(client.fetch_list_items(SITE_ID, LIST_ID)) == TOTAL
+        contadores = graph.contadores()
+
+    assert contadores["nao_autorizado"] == 1
+    assert contadores["tokens"] == 2
+
+
+# 🔁 Delta: só as mudanças trafegam, remoções saem do snapshot
+def test_delta_aplica_alteracoes_e_remocoes(dados, tmp_path):
+    with GraphLocal(dados, pagina_maxima=10) as graph:
+        client = _cliente(graph, page_size=10)
+        assert _ids(sincronizar_itens(client, SITE_ID, LIST_ID, str(tmp_path))) == list(range(1, TOTAL + 1))
+
+        graph.alterar({"3": {"Resposta": "editada"}, "26": {"Resposta": "nova", "Nota": 7}}, removidos=["5", "7"])
+        graph.zerar_contadores()
+        linhas = sincronizar_itens(client, SITE_ID, LIST_ID, str(tmp_path))
+
+        assert graph.contadores()["paginas"] == 1
+
+    esperado = [i for i in range(1, TOTAL + 2) if i not in (5, 7)]
+    assert _ids(linhas) == esperado
+    por_id = {linha["id"]: linha for linha in linhas}
+    assert por_id["3"]["field_1"] == "editada"
+    assert por_id["3"]["field_2"] == "3"
+    assert por_id["26"] == {"@odata.etag": '"26,1"', "id": "26", "field_1": "nova", "field_2": "7"}
+
+
+# ⌛ deltaLink expirado (410): ressincroniza do zero e volta a usar delta
+def test_delta_expirado_ressincroniza(dados, tmp_path):
+    with GraphLocal(dados, pagina_maxima=10) as graph:
+        client = _cliente(graph, page_size=10)
+        sincronizar_itens(client, SITE_ID, LIST_ID, str(tmp_path))
+
+        graph.expirar_delta()
+        graph.alterar(removidos=["1"])
+        graph.zerar_contadores()
+        linhas = sincronizar_itens(client, SITE_ID, LIST_ID, str(tmp_path))
+
+        # 410 + leitura completa em 3 páginas
+        assert graph.contadores()["paginas"] == 3
+        assert _ids(linhas) == list(range(2, TOTAL + 1))
+
+        graph.alterar(removidos=["2"])
+        graph.zerar_contadores()
+        linhas = sincronizar_itens(client, SITE_ID, LIST_ID, str(tmp_path))
+
+        assert graph.contadores()["paginas"] == 1
+
+    assert _ids(linhas) == list(range(3, TOTAL + 1))
+
+
+@pytest.fixture
+def secrets_graph(monkeypatch, tmp_path):
+    from src import load_data
+
+    def configurar(graph: GraphLocal, modo: str = "delta"):
+        monkeypatch.setattr(
+            load_data.st,
+            "secrets",
+            {
+                "GRAPH_TENANT_ID": "local",
+                "GRAPH_CLIENT_ID": "teste",
+                "GRAPH_CLIENT_SECRET": "teste",
+                "GRAPH_BASE_URL": graph.base_url,
+                "GRAPH_AUTHORITY": graph.authority,
+                "GRAPH_BACKOFF_FACTOR": 0,
+                "GRAPH_PAGE_SIZE": 200,
+                "GRAPH_SYNC_MODE": modo,
+                "CACHE_DIR": str(tmp_path),
+            },
+        )
+
+    return configurar
+
+
+# 🆔 Carga do app (projeção $select): cada resposta mantém o id do SharePoint,
+# mesmo depois de uma exclusão no meio da lista
+@pytest.mark.parametrize("modo", ["delta", "completo"])
+def test_carga_sharepoint_preserva_id_das_respostas(modo, secrets_graph):
+    from src import load_data
+    from src.nlp_textos import ids_das_respostas
+
+    with GraphLocal(pagina_maxima=200) as graph:
+        secrets_graph(graph, modo)
+
+        antes, _ = load_data._baixar_sharepoint()
+        ids_antes = dict(zip(ids_das_respostas(antes), antes["Qual o seu Curso?"]))
+
+        graph.alterar(removidos=["3"])
+        depois, _ = load_data._baixar_sharepoint()
+        ids_depois = dict(zip(ids_das_respostas(depois), depois["Qual o seu Curso?"]))
+
+    total = len(graph.itens) + 1
+    assert sorted(ids_antes, key=int) == [str(i) for i in range(1, total + 1)]
+    assert set(ids_depois) == set(ids_antes) - {"3"}
+    assert all(ids_depois[i] == ids_antes[i] for i in ids_depois)
+
+
+# 💤 Delta sem mudanças: mesmo DataFrame (a versão e os caches continuam) e
+# nenhum snapshot regravado
+def test_carga_sem_alteracoes_devolve_o_mesmo_dataframe(secrets_graph, tmp_path):
+    from src import load_data
+
+    with GraphLocal(pagina_maxima=200) as graph:
+        secrets_graph(graph)
+        fonte = load_data.FonteSharePoint()
+
+        primeiro, _ = fonte.carregar()
+        arquivos = {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+
+        segundo, _ = fonte.carregar()
+        assert segundo is primeiro
+        assert {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()} == arquivos
+
+        graph.alterar({"2": {"Qual o seu Curso?": "Direito"}})
+        terceiro, _ = fonte.carregar()
+
+    assert terceiro is not primeiro
+    assert len(terceiro) == len(primeiro)
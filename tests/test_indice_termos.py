@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from src.colunas import COLUNA_EXPECTATIVAS, COLUNA_MOTIVOS, COLUNA_OBJETIVOS
+from src.indice_termos import IndiceTermos, frequencia_termos, indice_termos
+from src.preprocess_text import tipo_da_coluna, tokenizar
+from src.utils.helpers import registrar_base
+
+CURSO = "Qual o seu Curso?"
+
+
+# Contagem anterior: tokeniza o recorte inteiro a cada filtro. A grafia exibida
+# sai da base inteira no índice e do recorte aqui, então a comparação ignora a caixa
+def _frequencias_como_antes(df: pd.DataFrame, coluna: str) -> dict:
+    return tokenizar(df[coluna], tipo_da_coluna(coluna)).str.lower().value_counts().to_dict()
+
+
+def _sem_caixa(frequencias: pd.Series) -> dict:
+    return dict(zip(frequencias.index.str.lower(), frequencias))
+
+
+@pytest.mark.parametrize("coluna", [COLUNA_MOTIVOS, COLUNA_EXPECTATIVAS, COLUNA_OBJETIVOS])
+def test_frequencias_iguais_a_tokenizar_o_recorte(base, coluna):
+    indice = IndiceTermos(base, coluna, tipo_da_coluna(coluna))
+
+    assert _sem_caixa(indice.frequencias(base)) == _frequencias_como_antes(base, coluna)
+    for _, recorte in base.groupby(CURSO, observed=True):
+        assert _sem_caixa(indice.frequencias(recorte)) == _frequencias_como_antes(recorte, coluna)
+
+    assert indice.frequencias(base.iloc[:0]).empty
+
+
+def test_ordem_decrescente_e_sem_zeros(base):
+    recorte = base.iloc[::5]
+    frequencias = IndiceTermos(base, COLUNA_MOTIVOS, "motivos").frequencias(recorte)
+
+    assert frequencias.is_monotonic_decreasing
+    assert (frequencias > 0).all()
+
+
+def test_indice_montado_uma_vez_por_versao(base):
+    df = base.copy(deep=False)
+    df.attrs["versao"] = "teste-18"
+    registrar_base(df)
+
+    recorte = df.iloc[::3]
+    recorte.attrs["versao"] = "teste-18"
+
+    assert indice_termos(recorte, COLUNA_MOTIVOS, "motivos") is indice_termos(df, COLUNA_MOTIVOS, "motivos")
+    frequencias = frequencia_termos(recorte, COLUNA_MOTIVOS, "motivos")
+    assert _sem_caixa(frequencias) == _frequencias_como_antes(recorte, COLUNA_MOTIVOS)
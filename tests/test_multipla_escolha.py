@@ -0,0 +1,128 @@
+import ast
+
+import pandas as pd
+
+from src.multipla_escolha import (
+    CATEGORIAS_CANAIS,
+    CATEGORIAS_INSTITUICOES,
+    coluna_da_pergunta,
+    construir_tabela,
+    separar_itens,
+)
+
+
+# Parsers anteriores (um laço Python por resposta), copiados dos gráficos antigos
+def _canais_como_antes(respostas: pd.Series) -> list:
+    def limpar_item(item):
+        return (
+            item.strip()
+            .lower()
+            .replace("[", "")
+            .replace("]", "")
+            .replace('"', "")
+            .replace("'", "")
+            .strip()
+        )
+
+    itens = []
+    for linha in respostas.dropna().astype(str):
+        for item in linha.split(";"):
+            item_limpo = limpar_item(item)
+            if item_limpo:
+                itens.append(item_limpo)
+    return itens
+
+
+def _instituicoes_como_antes(respostas: pd.Series) -> list:
+    itens = []
+    for linha in respostas.dropna().astype(str):
+        try:
+            if linha.startswith("[") and linha.endswith("]"):
+                partes = ast.literal_eval(linha)
+            else:
+                partes = linha.split(";")
+            itens.extend(p.strip() for p in partes if p.strip())
+        except Exception:
+            continue
+    return itens
+
+
+# Mudanças intencionais do parser novo: espaço não separável normalizado e
+# listas literais separadas item a item (antes viravam um item só, em "Outros")
+def _com_correcoes(respostas: pd.Series) -> pd.Series:
+    def corrigir(linha: str) -> str:
+        linha = linha.replace("\xa0", " ").strip()
+        if linha.startswith("[") and linha.endswith("]"):
+            return ";".join(ast.literal_eval(linha))
+        return linha
+
+    return respostas.dropna().astype(str).map(corrigir)
+
+
+def _categoria(item: str, categorias: dict, outros: str) -> str:
+    for categoria, termos in categorias.items():
+        if item in termos:
+            return categoria
+    return outros
+
+
+def test_separar_itens_formatos():
+    respostas = pd.Series(
+        ["Família;Amigos;", '["USP (Fuvest)", "FGV"]', "['Insper']", None, " ;  ", "Site\xa0da FECAP ; Prouni"],
+        index=[10, 11, 12, 13, 14, 15],
+    )
+
+    itens = separar_itens(respostas)
+
+    assert itens.tolist() == ["Família", "Amigos", "USP (Fuvest)", "FGV", "Insper", "Site da FECAP", "Prouni"]
+    assert itens.index.tolist() == [10, 10, 11, 11, 12, 15, 15]
+
+
+def test_canais_iguais_ao_parser_anterior(base):
+    coluna = coluna_da_pergunta(base, "canais")
+    tabela = construir_tabela(base, "canais")
+
+    antes = _canais_como_antes(_com_correcoes(base[coluna]))
+    assert sorted(tabela["item"].astype(str)) == sorted(antes)
+
+    categorias = pd.Series([_categoria(i, CATEGORIAS_CANAIS, "Outros") for i in antes]).value_counts()
+    contagem = tabela["categoria"].astype(str).value_counts()
+    pd.testing.assert_series_equal(contagem.sort_index(), categorias.sort_index(), check_names=False)
+
+
+def test_instituicoes_iguais_ao_parser_anterior(base):
+    coluna = coluna_da_pergunta(base, "instituicoes")
+    tabela = construir_tabela(base, "instituicoes")
+
+    antes = _instituicoes_como_antes(_com_correcoes(base[coluna]))
+    assert sorted(tabela["item"].astype(str)) == sorted(antes)
+
+    categorias = pd.Series([_categoria(i, CATEGORIAS_INSTITUICOES, "Outro") for i in antes]).value_counts()
+    contagem = tabela["categoria"].astype(str).value_counts()
+    pd.testing.assert_series_equal(contagem.sort_index(), categorias.sort_index(), check_names=False)
+
+
+def test_tabela_aponta_a_linha_da_resposta(base):
+    coluna = coluna_da_pergunta(base, "canais")
+    tabela = construir_tabela(base, "canais")
+
+    for linha, itens in tabela.groupby("linha")["item"]:
+        assert sorted(itens.astype(str)) == sorted(_canais_como_antes(_com_correcoes(base.loc[[linha], coluna])))
+
+
+def test_mudancas_intencionais_do_parser():
+    df = pd.DataFrame({
+        "Por quais meios você conheceu a FECAP?": [
+            '["Família", "Amigos"]',
+            "Rankings Especializados (Ex.:\xa0Guia da Faculdade);",
+        ]
+    })
+
+    tabela = construir_tabela(df, "canais")
+
+    assert tabela["item"].astype(str).tolist() == [
+        "família",
+        "amigos",
+        "rankings especializados (ex.: guia da faculdade)",
+    ]
+    assert tabela["categoria"].astype(str).tolist() == ["Indicação", "Indicação", "Reputação/Ranking"]
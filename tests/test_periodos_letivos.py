@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from src.load_data import COLUNA_ANO_LETIVO, COLUNA_SEMESTRE, derivar_periodos_letivos
+
+DATA = "Hora de início"
+
+
+# Regra anterior do app.py: 1º semestre até junho, uma chamada por linha
+def _extrair_semestre(data):
+    if pd.isnull(data):
+        return None
+    return f"{data.year}-{1 if data.month <= 6 else 2}"
+
+
+def _rotulos(serie: pd.Series) -> list:
+    return [None if pd.isna(valor) else valor for valor in serie]
+
+
+@pytest.fixture
+def datas() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            DATA: [
+                "15/01/2024 10:00",
+                "30/06/2024 23:59",
+                "01/07/2024 00:00",
+                "31/12/2024 12:00",
+                None,
+                "data inválida",
+                "02/02/2025 08:30",
+                "15/07/2023 09:00",
+            ]
+        }
+    )
+
+
+def test_semestres_iguais_a_regra_anterior(base):
+    esperado = pd.to_datetime(base[DATA], errors="coerce", dayfirst=True).apply(_extrair_semestre)
+
+    assert _rotulos(base[COLUNA_SEMESTRE]) == _rotulos(esperado)
+
+
+def test_semestre_categorico_ordenado_e_ano_letivo(datas):
+    esperado = pd.to_datetime(datas[DATA], errors="coerce", dayfirst=True).apply(_extrair_semestre)
+    df = derivar_periodos_letivos(datas)
+    semestres = df[COLUNA_SEMESTRE]
+
+    assert _rotulos(semestres) == _rotulos(esperado)
+
+    assert semestres.cat.ordered
+    assert list(semestres.cat.categories) == ["2023-2", "2024-1", "2024-2", "2025-1"]
+    assert df[COLUNA_ANO_LETIVO].tolist()[:4] == [2024, 2024, 2024, 2024]
+    assert df[COLUNA_ANO_LETIVO].isna().tolist()[4:6] == [True, True]
+
+
+def test_corte_configurado(datas):
+    df = derivar_periodos_letivos(datas, corte=(8, 1))
+
+    # 01/07 e 15/07 passam a ser do 1º semestre
+    assert df[COLUNA_SEMESTRE].tolist()[2] == "2024-1"
+    assert df[COLUNA_SEMESTRE].tolist()[7] == "2023-1"
+
+
+def test_calendario_academico(datas):
+    calendario = {"2024-1": "2024-02-01", "2024-2": "2024-07-15", "2025-1": "2025-02-01"}
+    df = derivar_periodos_letivos(datas, calendario=calendario)
+    semestres = _rotulos(df[COLUNA_SEMESTRE])
+
+    # Antes do primeiro início (jan/2024, jul/2023) fica sem período
+    assert semestres == [None, "2024-1", "2024-1", "2024-2", None, None, "2025-1", None]
+    assert list(df[COLUNA_SEMESTRE].cat.categories) == ["2024-1", "2024-2", "2025-1"]
+    assert df[COLUNA_ANO_LETIVO].tolist()[3] == 2024
+
+
+def test_sem_coluna_de_data():
+    df = pd.DataFrame({"outra": [1, 2]})
+    assert derivar_periodos_letivos(df).columns.tolist() == ["outra"]
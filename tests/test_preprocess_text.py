@@ -0,0 +1,53 @@
+import pandas as pd
+
+from src.colunas import COLUNA_EXPECTATIVAS, COLUNA_MOTIVOS, COLUNA_OBJETIVOS
+from src.preprocess_text import dobrar, limpar_texto, palavras_descartadas, tipo_da_coluna, tokenizar
+
+
+def test_descarta_stopwords_e_indesejadas_sem_diferenciar_caixa_e_acento():
+    respostas = pd.Series(["A FECAP tem ótima Localizacao e Localização, com pós-graduação em 2024!"])
+
+    assert tokenizar(respostas).tolist() == ["pós-graduação"]
+
+
+def test_palavras_mantem_a_grafia_mais_usada():
+    respostas = pd.Series(["Mercado financeiro", "mercado e MEC", "o mercado", "MEC"], index=[5, 6, 7, 8])
+
+    palavras = tokenizar(respostas)
+
+    assert palavras.tolist() == ["mercado", "financeiro", "mercado", "MEC", "mercado", "MEC"]
+    assert palavras.index.tolist() == [5, 5, 6, 6, 7, 8]
+
+
+def test_lista_por_coluna():
+    respostas = pd.Series(["mercado de trabalho"])
+
+    assert tokenizar(respostas, tipo_da_coluna(COLUNA_MOTIVOS)).tolist() == ["mercado"]
+    assert tokenizar(respostas, tipo_da_coluna(COLUNA_EXPECTATIVAS)).empty
+    assert tipo_da_coluna(COLUNA_OBJETIVOS) == "objetivos"
+    assert tipo_da_coluna("Coluna qualquer") == "motivos"
+
+
+def test_igual_a_limpar_texto_resposta_a_resposta(base):
+    for coluna in (COLUNA_MOTIVOS, COLUNA_EXPECTATIVAS, COLUNA_OBJETIVOS):
+        tipo = tipo_da_coluna(coluna)
+        por_linha = tokenizar(base[coluna], tipo).str.lower().groupby(level=0).agg(list)
+
+        for linha, texto in base[coluna].dropna().items():
+            assert por_linha.get(linha, []) == limpar_texto(texto, tipo).lower().split()
+
+
+# Filtro anterior (split por espaço, comparação exata em minúsculas): nas
+# respostas sem pontuação e sem variação de acento o resultado é o mesmo
+def test_igual_ao_filtro_anterior_em_texto_simples():
+    descartadas = palavras_descartadas("motivos")
+    texto = "Escolhi a FECAP pela tradição e pelo corpo docente muito qualificado"
+
+    antes = [p for p in texto.split() if dobrar(p) not in descartadas]
+
+    assert tokenizar(pd.Series([texto])).tolist() == antes
+    assert limpar_texto(texto) == " ".join(antes)
+
+
+def test_entradas_vazias():
+    assert tokenizar(pd.Series([None, "", "123 ... !!"], dtype=object)).empty
@@ -0,0 +1,94 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src import snapshot_store
+from src.snapshot_store import carregar_snapshot, salvar_snapshot
+
+NOME = "ingressantes"
+ORIGEM = "site/lista"
+SCHEMA = "schema-v1"
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": ["1", "2", "3"],
+            "Curso": pd.Categorical(["ADM", "ECO", "ADM"]),
+            "Nota": pd.array([9, None, 7], dtype="Int8"),
+        }
+    )
+
+
+@pytest.fixture
+def salvo(df, tmp_path) -> str:
+    salvar_snapshot(df, NOME, "lista-1", str(tmp_path), origem=ORIGEM, schema=SCHEMA)
+    return str(tmp_path)
+
+
+def test_le_o_snapshot_gravado(df, salvo):
+    lido, meta = carregar_snapshot(NOME, salvo, "lista-1", origem=ORIGEM, schema=SCHEMA)
+
+    pd.testing.assert_frame_equal(lido, df)
+    assert meta["rows"] == 3
+    assert (meta["origem"], meta["schema"], meta["list_id"]) == (ORIGEM, SCHEMA, "lista-1")
+
+
+@pytest.mark.parametrize(
+    "esperado",
+    [
+        {"list_id": "lista-2"},
+        {"origem": "outro-site/lista"},
+        {"schema": "schema-v2"},
+    ],
+    ids=["lista", "origem", "schema"],
+)
+def test_rejeita_snapshot_de_outra_lista_ou_schema(salvo, esperado):
+    conferencia = {"list_id": "lista-1", "origem": ORIGEM, "schema": SCHEMA, **esperado}
+
+    assert carregar_snapshot(NOME, salvo, **conferencia) == (None, None)
+
+
+def test_campos_nao_informados_nao_sao_conferidos(salvo):
+    lido, _ = carregar_snapshot(NOME, salvo)
+    assert len(lido) == 3
+
+
+def test_snapshot_antigo_sem_origem_e_schema_e_rejeitado(df, tmp_path):
+    salvar_snapshot(df, NOME, "lista-1", str(tmp_path))
+
+    assert carregar_snapshot(NOME, str(tmp_path), origem=ORIGEM, schema=SCHEMA) == (None, None)
+
+
+def test_sidecar_de_outra_geracao_e_rejeitado(salvo):
+    caminho = f"{salvo}/{NOME}.meta.json"
+    with open(caminho, encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["rows"] = 4
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    assert carregar_snapshot(NOME, salvo) == (None, None)
+
+
+def test_inexistente_ou_corrompido(tmp_path):
+    assert carregar_snapshot(NOME, str(tmp_path)) == (None, None)
+
+    (tmp_path / f"{NOME}.meta.json").write_text("{", encoding="utf-8")
+    assert carregar_snapshot(NOME, str(tmp_path)) == (None, None)
+
+
+def test_pickle_quando_parquet_nao_serve(tmp_path, monkeypatch):
+    aninhado = pd.DataFrame({"id": ["1", "2"], "lookup": [{"a": 1}, [1, 2]]})
+
+    meta = salvar_snapshot(aninhado, NOME, cache_dir=str(tmp_path))
+    lido, _ = carregar_snapshot(NOME, str(tmp_path))
+
+    assert meta["formato"] == "pickle"
+    assert lido["lookup"].tolist() == [{"a": 1}, [1, 2]]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{NOME}.meta.json", f"{NOME}.pkl"]
+
+    monkeypatch.setattr(snapshot_store, "PARQUET_DISPONIVEL", False)
+    assert salvar_snapshot(aninhado.iloc[:1], NOME, cache_dir=str(tmp_path))["formato"] == "pickle"